@@ -4,13 +4,26 @@ Flask API for News Sentiment Scraper
 Provides REST endpoints for news sentiment analysis
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, Response, g
 from flask_cors import CORS
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 import os
+import time
+import base64
+import hmac
+import binascii
+from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from news_sentiment_scraper import NewsSentimentScraper
+from response_cache import ResponseCache, make_cache_backend
+from prefetch import PrefetchScheduler, parse_watchlist, PREFETCH_WATCHLIST, PREFETCH_REFRESH_RATIO
+from sentiment_push import SentimentBroadcaster
+from serialization import SerializedResponse, serialize_response, dumps
+from tracing import ProfileSampler, start_trace, end_trace, current_trace, propagate
+from metrics import REGISTRY, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from article_store import ArticleStore, ARTICLE_STORE_PATH, BUCKET_SECONDS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,36 +33,245 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend integration
 
-# Initialize news scraper
-news_scraper = NewsSentimentScraper()
+# Initialize news scraper with persistent article history for incremental refreshes
+article_store = ArticleStore(ARTICLE_STORE_PATH)
+news_scraper = NewsSentimentScraper(article_store=article_store)
 
-# Cache for storing recent sentiment data
-sentiment_cache = {}
+# Cache for storing recent sentiment data, shared across workers when
+# SENTIMENT_CACHE_BACKEND=sqlite
 CACHE_DURATION = 30  # 30 seconds for testing (was 5 minutes)
+sentiment_cache = ResponseCache(ttl=CACHE_DURATION, backend=make_cache_backend())
+# Recomputed summaries may reuse an article window only this fresh, so a refresh ahead of
+# expiry (at PREFETCH_REFRESH_RATIO of the TTL) scrapes instead of re-serving the old window
+SUMMARY_WINDOW_MAX_AGE = CACHE_DURATION * (1 - PREFETCH_REFRESH_RATIO)
 
 def is_cache_valid(cache_key: str) -> bool:
     """Check if cached data is still valid"""
-    if cache_key not in sentiment_cache:
-        return False
-    
-    cache_time = sentiment_cache[cache_key].get('timestamp', 0)
-    current_time = datetime.now().timestamp()
-    
-    return (current_time - cache_time) < CACHE_DURATION
+    return get_cached_sentiment(cache_key) is not None
 
 def get_cached_sentiment(cache_key: str):
     """Get cached sentiment data if valid"""
-    if is_cache_valid(cache_key):
-        return sentiment_cache[cache_key]['data']
-    return None
+    return sentiment_cache.get(cache_key)
 
 def cache_sentiment(cache_key: str, data):
     """Cache sentiment data with timestamp"""
-    sentiment_cache[cache_key] = {
-        'data': data,
-        'timestamp': datetime.now().timestamp()
+    sentiment_cache.set(cache_key, data)
+
+def summary_cache_key(symbol: str, days_back: int) -> str:
+    """Cache key for a symbol's sentiment summary"""
+    return f"{symbol}_{days_back}"
+
+def fetch_summary(symbol: str, days_back: int) -> SerializedResponse:
+    """Scrape and summarize sentiment for a symbol, pushing it to subscribers if it changed"""
+    logger.info(f"Fetching fresh sentiment data for {symbol}")
+    summary = news_scraper.get_news_sentiment_summary(symbol, days_back, max_age=SUMMARY_WINDOW_MAX_AGE)
+    broadcaster.publish(symbol, days_back, summary)
+    # Cache the encoded bytes so hits skip serialization entirely
+    return serialize_response(summary)
+
+def get_or_fetch_summary(symbol: str, days_back: int) -> SerializedResponse:
+    """Return the cached summary for a symbol, scraping once for all concurrent misses"""
+    prefetcher.record_request(symbol, days_back)
+    return sentiment_cache.get_or_compute(
+        summary_cache_key(symbol, days_back),
+        lambda: fetch_summary(symbol, days_back)
+    )
+
+# Batch requests: symbols per request, and how many cache misses are scraped at once
+BATCH_MAX_SYMBOLS = int(os.environ.get('BATCH_MAX_SYMBOLS', 500))
+BATCH_MAX_WORKERS = int(os.environ.get('BATCH_MAX_WORKERS', 16))
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix='batch')
+
+def start_batch(symbols, days_back: int):
+    """Resolve cache hits inline and submit misses to the batch pool.
+    
+    Returns (hits, pending) where pending maps each future to its symbol.
+    """
+    hits = {}
+    pending = {}
+    for symbol in symbols:
+        cached = sentiment_cache.get(summary_cache_key(symbol, days_back), count_miss=False)
+        if cached is not None:
+            prefetcher.record_request(symbol, days_back)
+            hits[symbol] = cached.data
+        else:
+            pending[batch_executor.submit(propagate(get_or_fetch_summary), symbol, days_back)] = symbol
+    return hits, pending
+
+def batch_error(symbol: str, error: Exception) -> dict:
+    """Per-symbol error record for batch responses"""
+    logger.error(f"Error processing symbol {symbol}: {error}")
+    return {
+        'error': f'Failed to process {symbol}',
+        'message': str(error)
     }
 
+def parse_batch_symbols(data):
+    """Validate a batch request body, returning (symbols, days_back, error_response)"""
+    if not data or 'symbols' not in data:
+        return None, None, (jsonify({
+            'error': 'Missing symbols array in request body'
+        }), 400)
+    
+    symbols = data['symbols']
+    days_back = data.get('days', 7)
+    
+    if not isinstance(symbols, list) or len(symbols) == 0:
+        return None, None, (jsonify({
+            'error': 'Symbols must be a non-empty array'
+        }), 400)
+    
+    if len(symbols) > BATCH_MAX_SYMBOLS:
+        return None, None, (jsonify({
+            'error': f'Maximum {BATCH_MAX_SYMBOLS} symbols allowed per batch request'
+        }), 400)
+    
+    if not all(isinstance(symbol, str) and symbol.strip() for symbol in symbols):
+        return None, None, (jsonify({
+            'error': 'Symbols must be non-empty strings'
+        }), 400)
+    
+    # Upper-case and drop repeats, keeping request order
+    symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols))
+    return symbols, days_back, None
+
+# Background refresher that keeps watchlist summaries warm ahead of expiry;
+# every refresh is offered to the push subscribers
+prefetcher = PrefetchScheduler(
+    sentiment_cache,
+    key_fn=summary_cache_key,
+    fetch_fn=fetch_summary,
+    watchlist=parse_watchlist(PREFETCH_WATCHLIST),
+    on_refresh=lambda symbol, days_back, entry: broadcaster.publish(symbol, days_back, entry.data if entry else None)
+)
+configured_watchlist = set(parse_watchlist(PREFETCH_WATCHLIST))
+
+def _unwatch_unless_configured(symbol: str, days_back: int):
+    if (symbol, days_back) not in configured_watchlist:
+        prefetcher.remove(symbol, days_back)
+
+# Each open SSE stream holds a worker thread, so streams are capped below the thread
+# count to leave threads for ordinary requests
+SUBSCRIBE_MAX_STREAMS = int(os.environ.get(
+    'SUBSCRIBE_MAX_STREAMS', max(1, int(os.environ.get('WEB_THREADS', 16)) // 2)
+))
+
+# Subscribed symbols join the prefetch watchlist while anyone is listening
+broadcaster = SentimentBroadcaster(
+    on_first_subscriber=prefetcher.add,
+    on_last_unsubscribe=_unwatch_unless_configured,
+    max_subscriptions=SUBSCRIBE_MAX_STREAMS
+)
+SUBSCRIBE_MAX_SYMBOLS = int(os.environ.get('SUBSCRIBE_MAX_SYMBOLS', 100))
+SUBSCRIBE_KEEPALIVE_SECONDS = 15
+
+def json_response(data, status: int = 200) -> Response:
+    """JSON response encoded with the fast serializer"""
+    return Response(dumps(data), status=status, mimetype='application/json')
+
+def send_serialized(entry: SerializedResponse) -> Response:
+    """Send a pre-serialized payload, answering 304 when the client already has it"""
+    if request.if_none_match.contains_weak(entry.etag):
+        response = Response(status=304)
+        response.set_etag(entry.etag)
+        return response
+    
+    body = entry.body
+    encoding = None
+    for coding in ('br', 'gzip'):
+        compressed = entry.encoded(coding)
+        if compressed is not None and request.accept_encodings[coding]:
+            body, encoding = compressed, coding
+            break
+    
+    response = Response(body, mimetype='application/json')
+    response.set_etag(entry.etag)
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+def start_background_services():
+    """Start background threads; call once per serving process"""
+    prefetcher.start()
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Time to build the response for each endpoint', ('endpoint', 'method', 'status'))
+
+# Admin endpoints (profiling) are disabled unless ADMIN_TOKEN is set
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+profile_sampler = ProfileSampler()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.trace_token = start_trace()
+    g.profiler = None
+    if not request.path.startswith('/admin/') and request.path != '/metrics':
+        g.profiler = profile_sampler.begin()
+
+@app.after_request
+def record_request_latency(response):
+    started = getattr(g, 'request_started', None)
+    if started is not None:
+        REQUEST_LATENCY.observe(time.perf_counter() - started, request.endpoint or 'unmatched',
+                                request.method, str(response.status_code))
+    trace = current_trace()
+    if trace is not None:
+        response.headers['Server-Timing'] = trace.server_timing()
+    return response
+
+@app.teardown_request
+def finish_request_trace(error=None):
+    capture = g.pop('profiler', None)
+    if capture is not None:
+        profile_sampler.finish(capture, f"{request.method}-{request.path}")
+    token = g.pop('trace_token', None)
+    if token is not None:
+        end_trace(token)
+
+def collect_service_metrics():
+    """Expose the existing cache, pool and push counters at scrape time"""
+    cache = sentiment_cache.stats()
+    yield 'sentiment_response_cache_lookups_total', 'counter', 'Response cache lookups by result', [
+        ({'result': result}, cache[result]) for result in ('hits', 'stale_hits', 'misses', 'coalesced')
+    ]
+    yield 'sentiment_response_cache_evictions_total', 'counter', 'Response cache evictions', [({}, cache['evictions'])]
+    yield 'sentiment_response_cache_entries', 'gauge', 'Response cache entries', [({}, cache['entries'])]
+    yield 'sentiment_response_cache_inflight', 'gauge', 'Response cache computations in flight', [({}, cache['inflight'])]
+    
+    scores = news_scraper.score_cache.stats()
+    yield 'sentiment_score_cache_lookups_total', 'counter', 'Score cache lookups by result', [
+        ({'result': result}, scores[result]) for result in ('hits', 'disk_hits', 'misses')
+    ]
+    yield 'sentiment_score_cache_evictions_total', 'counter', 'Score cache evictions', [({}, scores['evictions'])]
+    yield 'sentiment_score_cache_entries', 'gauge', 'Score cache entries', [({}, scores['entries'])]
+    
+    pool = news_scraper.scoring_pool
+    yield 'sentiment_scoring_queue_depth', 'gauge', 'Texts queued or running in the scoring pool', [
+        ({}, pool.pending_texts if pool else 0)
+    ]
+    
+    quota = news_scraper.quota.stats()
+    yield 'news_provider_circuit_open', 'gauge', '1 while a provider circuit breaker is open', [
+        ({'provider': provider}, int(stats['circuit'] == 'open')) for provider, stats in quota.items()
+    ]
+    
+    ticker_index = news_scraper.ticker_index.stats()
+    yield 'news_ticker_index_postings', 'gauge', 'Alpha Vantage articles indexed per mentioned ticker', [
+        ({}, ticker_index['postings'])
+    ]
+    
+    push = broadcaster.stats()
+    yield 'sentiment_push_subscribers', 'gauge', 'Open SSE subscriptions', [({}, push['subscribers'])]
+    yield 'sentiment_push_events_total', 'counter', 'Aggregates published to subscribers', [({}, push['published'])]
+    yield 'sentiment_push_rejected_total', 'counter', 'SSE subscriptions refused at the per-worker cap', [({}, push['rejected_subscriptions'])]
+    yield 'sentiment_prefetch_refreshes_total', 'counter', 'Watchlist entries refreshed ahead of expiry', [
+        ({}, prefetcher.stats()['refreshes'])
+    ]
+
+REGISTRY.register_collector(collect_service_metrics)
+
 @app.route('/')
 def home():
     """API home endpoint"""
@@ -58,9 +280,14 @@ def home():
         'version': '1.0.0',
         'endpoints': {
             'GET /sentiment/<symbol>': 'Get news sentiment for a stock symbol',
-            'GET /sentiment/<symbol>/articles': 'Get detailed articles for a stock symbol',
+            'GET /sentiment/<symbol>/articles': 'Get detailed articles for a stock symbol (fields=a,b for projection, cursor=next_cursor to page)',
             'GET /sentiment/batch': 'Get sentiment for multiple symbols',
-            'GET /health': 'API health check'
+            'POST /sentiment/batch/stream': 'Stream batch sentiment as NDJSON (or SSE with format=sse), one record per symbol',
+            'GET /sentiment/subscribe?symbols=A,B': 'Server-Sent Events push of sentiment changes for a symbol set',
+            'GET /sentiment/trends/<symbol>': 'Get hourly or daily sentiment time series (interval=hour|day)',
+            'GET /health': 'API health check',
+            'GET /metrics': 'Prometheus metrics',
+            'POST /admin/profile?requests=N': 'Write cProfile dumps for the next N requests (X-Admin-Token)'
         }
     })
 
@@ -74,9 +301,34 @@ def health_check():
             'newsapi': news_scraper.news_apis['newsapi']['enabled'],
             'alpha_vantage': news_scraper.news_apis['alpha_vantage']['enabled'],
             'polygon': news_scraper.news_apis['polygon']['enabled']
-        }
+        },
+        'http_pools': news_scraper.http_stats(),
+        'provider_quota': news_scraper.quota.stats(),
+        'response_cache': sentiment_cache.stats(),
+        'prefetch': prefetcher.stats(),
+        'push': broadcaster.stats(),
+        'score_cache': news_scraper.score_cache.stats(),
+        'ticker_index': news_scraper.ticker_index.stats()
     })
 
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(REGISTRY.render(), content_type=METRICS_CONTENT_TYPE)
+
+@app.route('/admin/profile', methods=['GET', 'POST'])
+def admin_profile():
+    """Arm the profiler for the next N requests, or report captured dumps"""
+    if not ADMIN_TOKEN:
+        return jsonify({'error': 'Admin endpoints disabled', 'message': 'Set ADMIN_TOKEN to enable them'}), 403
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), ADMIN_TOKEN):
+        return jsonify({'error': 'Forbidden', 'message': 'Missing or invalid X-Admin-Token'}), 403
+    
+    if request.method == 'POST':
+        armed = profile_sampler.arm(request.args.get('requests', 1, type=int))
+        logger.info(f"Profiling armed for the next {armed} requests")
+    return jsonify(profile_sampler.stats())
+
 @app.route('/sentiment/<symbol>')
 def get_sentiment(symbol):
     """Get news sentiment for a single stock symbol"""
@@ -84,22 +336,7 @@ def get_sentiment(symbol):
         symbol = symbol.upper()
         days_back = request.args.get('days', 7, type=int)
         
-        # Check cache first
-        cache_key = f"{symbol}_{days_back}"
-        cached_data = get_cached_sentiment(cache_key)
-        
-        if cached_data:
-            logger.info(f"Returning cached sentiment data for {symbol}")
-            return jsonify(cached_data)
-        
-        # Fetch fresh data
-        logger.info(f"Fetching fresh sentiment data for {symbol}")
-        summary = news_scraper.get_news_sentiment_summary(symbol, days_back)
-        
-        # Cache the result
-        cache_sentiment(cache_key, summary)
-        
-        return jsonify(summary)
+        return send_serialized(get_or_fetch_summary(symbol, days_back))
         
     except Exception as e:
         logger.error(f"Error fetching sentiment for {symbol}: {e}")
@@ -109,55 +346,63 @@ def get_sentiment(symbol):
             'symbol': symbol
         }), 500
 
+ARTICLE_FIELDS = ('title', 'description', 'content', 'url', 'published_at', 'source',
+                  'sentiment_score', 'sentiment_label')
+ARTICLES_MAX_LIMIT = 100
+
+def encode_cursor(article) -> str:
+    """Opaque cursor pointing just past an article in newest-first order"""
+    return base64.urlsafe_b64encode(f"{article.published_ts}:{article.url}".encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor: str) -> Tuple[int, str]:
+    """(published_ts, url) position from a cursor, ValueError when malformed"""
+    try:
+        published_ts, url = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split(':', 1)
+        return int(published_ts), url
+    except (UnicodeError, binascii.Error, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
 @app.route('/sentiment/<symbol>/articles')
 def get_articles(symbol):
-    """Get detailed articles for a stock symbol"""
+    """Get detailed articles for a stock symbol, one cursor page at a time"""
     try:
         symbol = symbol.upper()
         days_back = request.args.get('days', 7, type=int)
-        limit = request.args.get('limit', 20, type=int)
-        
-        # Check cache first
-        cache_key = f"{symbol}_articles_{days_back}_{limit}"
-        cached_data = get_cached_sentiment(cache_key)
+        limit = max(1, min(request.args.get('limit', 20, type=int), ARTICLES_MAX_LIMIT))
         
-        if cached_data:
-            logger.info(f"Returning cached articles for {symbol}")
-            return jsonify(cached_data)
+        fields = ARTICLE_FIELDS
+        if request.args.get('fields'):
+            fields = tuple(field.strip() for field in request.args['fields'].split(',') if field.strip())
+            unknown = [field for field in fields if field not in ARTICLE_FIELDS]
+            if unknown:
+                return jsonify({
+                    'error': 'Invalid fields',
+                    'message': f"Unknown fields {unknown}, choose from {list(ARTICLE_FIELDS)}"
+                }), 400
         
-        # Fetch fresh data
-        logger.info(f"Fetching fresh articles for {symbol}")
-        articles = news_scraper.scrape_news_for_symbol(symbol, days_back)
+        before = None
+        if request.args.get('cursor'):
+            try:
+                before = decode_cursor(request.args['cursor'])
+            except ValueError as e:
+                return jsonify({'error': 'Invalid cursor', 'message': str(e)}), 400
         
-        # Limit results
-        limited_articles = articles[:limit]
+        # Pages are sliced from the symbol's shared article window, so paging never re-scrapes
+        articles, total_articles, built_at = news_scraper.get_article_page(symbol, days_back, limit, before)
+        next_cursor = encode_cursor(articles[-1]) if len(articles) == limit else None
         
-        # Format response
-        response_data = {
+        return send_serialized(serialize_response({
             'symbol': symbol,
-            'analysis_date': datetime.now().isoformat(),
+            'analysis_date': datetime.fromtimestamp(built_at).isoformat(),
             'days_analyzed': days_back,
-            'total_articles': len(articles),
-            'returned_articles': len(limited_articles),
+            'total_articles': total_articles,
+            'returned_articles': len(articles),
+            'next_cursor': next_cursor,
             'articles': [
-                {
-                    'title': article.title,
-                    'description': article.description,
-                    'content': article.content,
-                    'url': article.url,
-                    'published_at': article.published_at,
-                    'source': article.source,
-                    'sentiment_score': article.sentiment_score,
-                    'sentiment_label': article.sentiment_label
-                }
-                for article in limited_articles
+                {field: getattr(article, field) for field in fields}
+                for article in articles
             ]
-        }
-        
-        # Cache the result
-        cache_sentiment(cache_key, response_data)
-        
-        return jsonify(response_data)
+        }))
         
     except Exception as e:
         logger.error(f"Error fetching articles for {symbol}: {e}")
@@ -169,51 +414,24 @@ def get_articles(symbol):
 
 @app.route('/sentiment/batch', methods=['POST'])
 def get_batch_sentiment():
-    """Get sentiment for multiple symbols at once"""
+    """Get sentiment for multiple symbols at once, scraping misses concurrently"""
     try:
-        data = request.get_json()
+        symbols, days_back, error_response = parse_batch_symbols(request.get_json())
+        if error_response:
+            return error_response
         
-        if not data or 'symbols' not in data:
-            return jsonify({
-                'error': 'Missing symbols array in request body'
-            }), 400
-        
-        symbols = data['symbols']
-        days_back = data.get('days', 7)
-        
-        if not isinstance(symbols, list) or len(symbols) == 0:
-            return jsonify({
-                'error': 'Symbols must be a non-empty array'
-            }), 400
-        
-        if len(symbols) > 10:
-            return jsonify({
-                'error': 'Maximum 10 symbols allowed per batch request'
-            }), 400
-        
-        results = {}
-        
-        for symbol in symbols:
+        results, pending = start_batch(symbols, days_back)
+        for future in as_completed(pending):
+            symbol = pending[future]
             try:
-                symbol = symbol.upper()
-                cache_key = f"{symbol}_{days_back}"
-                cached_data = get_cached_sentiment(cache_key)
-                
-                if cached_data:
-                    results[symbol] = cached_data
-                else:
-                    summary = news_scraper.get_news_sentiment_summary(symbol, days_back)
-                    cache_sentiment(cache_key, summary)
-                    results[symbol] = summary
-                    
+                results[symbol] = future.result().data
             except Exception as e:
-                logger.error(f"Error processing symbol {symbol}: {e}")
-                results[symbol] = {
-                    'error': f'Failed to process {symbol}',
-                    'message': str(e)
-                }
+                results[symbol] = batch_error(symbol, e)
         
-        return jsonify({
+        # Report in request order regardless of completion order
+        results = {symbol: results[symbol] for symbol in symbols}
+        
+        return json_response({
             'batch_results': results,
             'processed_at': datetime.now().isoformat(),
             'total_symbols': len(symbols)
@@ -226,26 +444,169 @@ def get_batch_sentiment():
             'message': str(e)
         }), 500
 
+def format_stream_record(record: dict, sse: bool) -> bytes:
+    """Encode one streamed record as an NDJSON line or a Server-Sent Event"""
+    payload = dumps(record)
+    if sse:
+        return b"event: " + record['type'].encode() + b"\ndata: " + payload + b"\n\n"
+    return payload + b'\n'
+
+@app.route('/sentiment/batch/stream', methods=['POST'])
+def stream_batch_sentiment():
+    """Stream batch results one symbol at a time, cache hits first, then a summary record"""
+    symbols, days_back, error_response = parse_batch_symbols(request.get_json(silent=True))
+    if error_response:
+        return error_response
+    
+    sse = (request.args.get('format') == 'sse'
+           or request.accept_mimetypes.best == 'text/event-stream')
+    started = time.monotonic()
+    hits, pending = start_batch(symbols, days_back)
+    
+    def generate():
+        errors = 0
+        for symbol, summary in hits.items():
+            yield format_stream_record({'type': 'result', 'symbol': symbol, 'cached': True, 'data': summary}, sse)
+        
+        for future in as_completed(pending):
+            symbol = pending[future]
+            try:
+                record = {'type': 'result', 'symbol': symbol, 'cached': False, 'data': future.result().data}
+            except Exception as e:
+                errors += 1
+                record = {'type': 'error', 'symbol': symbol, **batch_error(symbol, e)}
+            yield format_stream_record(record, sse)
+        
+        yield format_stream_record({
+            'type': 'summary',
+            'total_symbols': len(symbols),
+            'cache_hits': len(hits),
+            'errors': errors,
+            'elapsed_ms': round((time.monotonic() - started) * 1000, 1),
+            'processed_at': datetime.now().isoformat()
+        }, sse)
+    
+    mimetype = 'text/event-stream' if sse else 'application/x-ndjson'
+    return Response(generate(), mimetype=mimetype, headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Keep reverse proxies from buffering the stream
+    })
+
+@app.route('/sentiment/subscribe')
+def subscribe_sentiment():
+    """Server-Sent Events stream of sentiment summaries, sent only when a symbol's aggregate changes"""
+    symbols = [symbol.strip().upper() for symbol in request.args.get('symbols', '').split(',') if symbol.strip()]
+    days_back = request.args.get('days', 7, type=int)
+    
+    if not symbols:
+        return jsonify({
+            'error': 'Provide symbols as a comma separated query parameter'
+        }), 400
+    
+    if len(symbols) > SUBSCRIBE_MAX_SYMBOLS:
+        return jsonify({
+            'error': f'Maximum {SUBSCRIBE_MAX_SYMBOLS} symbols allowed per subscription'
+        }), 400
+    
+    symbols = list(dict.fromkeys(symbols))
+    subscription = broadcaster.subscribe((symbol, days_back) for symbol in symbols)
+    if subscription is None:
+        return jsonify({
+            'error': f'Maximum {SUBSCRIBE_MAX_STREAMS} open subscriptions per worker, retry later'
+        }), 503
+    
+    def generate():
+        try:
+            # Start the client from whatever the server already knows
+            for symbol in symbols:
+                cached = sentiment_cache.peek(summary_cache_key(symbol, days_back))
+                summary = broadcaster.latest(symbol, days_back) or (cached.data if cached else None)
+                if summary:
+                    yield format_stream_record({'type': 'sentiment', 'symbol': symbol, 'data': summary}, sse=True)
+            
+            while True:
+                update = subscription.next_update(timeout=SUBSCRIBE_KEEPALIVE_SECONDS)
+                if update is None:
+                    yield b': keepalive\n\n'
+                    continue
+                yield format_stream_record({'type': 'sentiment', 'symbol': update['symbol'], 'data': update['data']}, sse=True)
+        finally:
+            broadcaster.unsubscribe(subscription)
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+def history_covered_from(symbol: str):
+    """Epoch from which every provider's stored history for a symbol is complete, None if there is none"""
+    watermarks = article_store.get_watermarks(symbol)
+    if not watermarks:
+        return None
+    # A provider's unfilled gap means its history is only complete after the gap
+    return max(gap[1] + 1 if gap else covered_from for _, covered_from, gap in watermarks.values())
+
 @app.route('/sentiment/trends/<symbol>')
 def get_sentiment_trends(symbol):
-    """Get sentiment trends over time for a symbol"""
+    """Get sentiment trends over time for a symbol from precomputed rollups"""
     try:
         symbol = symbol.upper()
         days_back = request.args.get('days', 30, type=int)
+        interval = request.args.get('interval', 'day')
+        
+        if interval not in BUCKET_SECONDS:
+            return jsonify({
+                'error': f"Interval must be one of: {', '.join(BUCKET_SECONDS)}"
+            }), 400
+        
+        # Rollups are maintained on ingest; only history that does not reach back far enough needs a scrape
+        since_ts = int(datetime.now().timestamp()) - days_back * 86400
+        covered_from = history_covered_from(symbol)
+        if covered_from is None or covered_from > since_ts:
+            logger.info(f"Stored history for {symbol} does not cover {days_back} days, ingesting before trend query")
+            news_scraper.scrape_news_for_symbol(symbol, days_back)
+            covered_from = history_covered_from(symbol)
+        
+        buckets = article_store.get_trend(symbol, since_ts, interval)
+        
+        series = []
+        total_count = 0
+        total_sum = 0.0
+        total_sq_sum = 0.0
+        for bucket in buckets:
+            count = bucket['article_count']
+            mean = bucket['score_sum'] / count
+            variance = max(0.0, bucket['score_sq_sum'] / count - mean * mean)
+            series.append({
+                'bucket_start': datetime.fromtimestamp(bucket['bucket_start'], tz=timezone.utc).isoformat(),
+                'average_sentiment': mean,
+                'article_count': count,
+                'positive_count': bucket['positive_count'],
+                'negative_count': bucket['negative_count'],
+                'neutral_count': bucket['neutral_count'],
+                'sentiment_confidence': max(0.0, 1 - variance)
+            })
+            total_count += count
+            total_sum += bucket['score_sum']
+            total_sq_sum += bucket['score_sq_sum']
         
-        # This would require historical data storage
-        # For now, return current sentiment with a note
-        summary = news_scraper.get_news_sentiment_summary(symbol, days_back)
+        period_sentiment = total_sum / total_count if total_count else 0.0
+        period_variance = max(0.0, total_sq_sum / total_count - period_sentiment ** 2) if total_count else 0.0
         
         return jsonify({
             'symbol': symbol,
-            'current_sentiment': summary['aggregate_sentiment']['average_sentiment'],
+            'current_sentiment': series[-1]['average_sentiment'] if series else 0.0,
             'trend_analysis': {
-                'note': 'Historical trend analysis requires data persistence',
                 'current_period': f'Last {days_back} days',
-                'sentiment_score': summary['aggregate_sentiment']['average_sentiment'],
-                'confidence': summary['aggregate_sentiment']['sentiment_confidence']
-            }
+                'interval': interval,
+                'sentiment_score': period_sentiment,
+                'confidence': max(0.0, 1 - period_variance) if total_count else 0.0,
+                'total_articles': total_count
+            },
+            'series': series,
+            # A provider that cannot reach back far enough leaves the older buckets partial
+            'covered_from': datetime.fromtimestamp(covered_from, tz=timezone.utc).isoformat() if covered_from else None,
+            'complete': covered_from is not None and covered_from <= since_ts
         })
         
     except Exception as e:
@@ -282,4 +643,5 @@ if __name__ == '__main__':
     logger.info(f"Starting News Sentiment API on port {port}")
     logger.info(f"Debug mode: {debug}")
     
+    start_background_services()
     app.run(host='0.0.0.0', port=port, debug=debug)
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Article Store
+SQLite-backed history of scored articles with per-provider watermarks
+"""
+
+import os
+import re
+import hashlib
+import sqlite3
+import threading
+import logging
+from typing import List, Dict, Tuple, Optional
+from urllib.parse import urlsplit
+
+from news_sentiment_scraper import NewsArticle
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_STORE_PATH = os.getenv('ARTICLE_STORE_PATH', 'news_articles.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    symbol TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    content TEXT,
+    published_at TEXT,
+    published_ts INTEGER NOT NULL,
+    source TEXT,
+    sentiment_score REAL NOT NULL,
+    sentiment_label TEXT NOT NULL,
+    PRIMARY KEY (symbol, provider, url)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_symbol_ts ON articles (symbol, published_ts);
+CREATE TABLE IF NOT EXISTS watermarks (
+    symbol TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    newest_ts INTEGER NOT NULL,
+    covered_from_ts INTEGER NOT NULL,
+    gap_from_ts INTEGER,
+    gap_until_ts INTEGER,
+    PRIMARY KEY (symbol, provider)
+);
+CREATE TABLE IF NOT EXISTS sentiment_buckets (
+    symbol TEXT NOT NULL,
+    granularity TEXT NOT NULL,
+    bucket_start INTEGER NOT NULL,
+    article_count INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    score_sq_sum REAL NOT NULL,
+    positive_count INTEGER NOT NULL,
+    negative_count INTEGER NOT NULL,
+    neutral_count INTEGER NOT NULL,
+    PRIMARY KEY (symbol, granularity, bucket_start)
+);
+CREATE TABLE IF NOT EXISTS bucket_members (
+    symbol TEXT NOT NULL,
+    identity TEXT NOT NULL,
+    PRIMARY KEY (symbol, identity)
+);
+"""
+
+# Rollup granularities maintained on ingest, in seconds per bucket
+BUCKET_SECONDS = {
+    'hour': 3600,
+    'day': 86400
+}
+
+
+# Copies of a story with the same title count once when published within this many days of each other
+TITLE_MATCH_DAYS = 1
+
+
+def article_identity(article: NewsArticle) -> Tuple[str, str]:
+    """Provider-independent keys for a story: its normalized URL and a hash of its normalized title.
+
+    Syndicated copies from different providers usually share one or the other,
+    so a story is counted once in the rollups whichever provider delivered it.
+    An article without a URL is keyed by its title, source and publish time instead.
+    """
+    parts = urlsplit(article.url.strip().lower())
+    host = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    path = parts.path.rstrip('/')
+    title = ' '.join(re.findall(r'[a-z0-9]+', article.title.lower()))
+    if host or path:
+        url_key = f"url:{host}{path}"
+    else:
+        story = f"{title}|{article.source.strip().lower()}|{article.published_ts}"
+        url_key = 'story:' + hashlib.sha1(story.encode('utf-8')).hexdigest()
+    title_key = 'title:' + hashlib.sha1(title.encode('utf-8')).hexdigest()
+    return url_key, title_key
+
+
+class ArticleStore:
+    """Persistent article history keyed by symbol, provider and URL"""
+
+    def __init__(self, path: str = ARTICLE_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        had_members = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'bucket_members'"
+        ).fetchone() is not None
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        if not had_members:
+            self._rebuild_buckets()
+        self._conn.commit()
+        logger.info(f"Article store opened at {path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _migrate(self):
+        """Add columns introduced after a store file was created"""
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(watermarks)')}
+        for column in ('gap_from_ts', 'gap_until_ts'):
+            if column not in columns:
+                self._conn.execute(f'ALTER TABLE watermarks ADD COLUMN {column} INTEGER')
+
+    def _rebuild_buckets(self):
+        """Recompute the rollups from stored articles, counting each story once.
+
+        Store files written before rollups were de-duplicated counted a story once per provider.
+        """
+        rows = self._conn.execute(
+            """
+            SELECT symbol, provider, url, title, published_ts, sentiment_score, sentiment_label
+            FROM articles ORDER BY published_ts
+            """
+        ).fetchall()
+        if not rows:
+            return
+        self._conn.execute('DELETE FROM sentiment_buckets')
+        for symbol, provider, url, title, published_ts, score, label in rows:
+            article = NewsArticle(title=title, description='', content='', url=url, published_ts=published_ts,
+                                  source='', sentiment_score=score, sentiment_label=label, provider=provider)
+            self._add_to_buckets(symbol, article)
+        logger.info(f"Rebuilt sentiment rollups from {len(rows)} stored articles")
+
+    def reopen(self):
+        """Open a fresh connection; SQLite connections must not be shared across fork"""
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    def get_watermarks(self, symbol: str) -> Dict[str, Tuple[int, int, Optional[Tuple[int, int]]]]:
+        """Return {provider: (newest_ts, covered_from_ts, gap)} for a symbol, gap being the
+        (from_ts, until_ts) range a truncated fetch left unfetched, or None"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT provider, newest_ts, covered_from_ts, gap_from_ts, gap_until_ts FROM watermarks WHERE symbol = ?',
+                (symbol,)
+            ).fetchall()
+        return {
+            provider: (newest_ts, covered_from, (gap_from, gap_until) if gap_from is not None else None)
+            for provider, newest_ts, covered_from, gap_from, gap_until in rows
+        }
+
+    def add_articles(self, symbol: str, provider: str, articles: List[NewsArticle],
+                     covered_from_ts: Optional[int] = None,
+                     gap: Optional[Tuple[int, int]] = None) -> List[NewsArticle]:
+        """Insert articles not seen before, advance the provider watermark and record the
+        provider's unfetched gap (None once its history is contiguous).
+
+        Returns the articles that were actually new to the store.
+        """
+        gap_from, gap_until = gap if gap else (None, None)
+        if not articles:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    'UPDATE watermarks SET gap_from_ts = ?, gap_until_ts = ? WHERE symbol = ? AND provider = ?',
+                    (gap_from, gap_until, symbol, provider)
+                )
+            return []
+
+        new_articles = []
+        with self._lock, self._conn:
+            for article in articles:
+                cursor = self._conn.execute(
+                    'INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (symbol, provider, article.url, article.title, article.description, article.content,
+                     article.published_at, article.published_ts, article.source,
+                     article.sentiment_score, article.sentiment_label)
+                )
+                if cursor.rowcount:
+                    new_articles.append(article)
+                    self._add_to_buckets(symbol, article)
+
+            newest_ts = max(article.published_ts for article in articles)
+            if covered_from_ts is None:
+                covered_from_ts = min(article.published_ts for article in articles)
+            self._conn.execute(
+                """
+                INSERT INTO watermarks (symbol, provider, newest_ts, covered_from_ts, gap_from_ts, gap_until_ts)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (symbol, provider) DO UPDATE SET
+                    newest_ts = MAX(newest_ts, excluded.newest_ts),
+                    covered_from_ts = MIN(covered_from_ts, excluded.covered_from_ts),
+                    gap_from_ts = excluded.gap_from_ts,
+                    gap_until_ts = excluded.gap_until_ts
+                """,
+                (symbol, provider, newest_ts, covered_from_ts, gap_from, gap_until)
+            )
+
+        return new_articles
+
+    def _add_to_buckets(self, symbol: str, article: NewsArticle):
+        """Fold one newly ingested story into every rollup granularity, unless another
+        provider's copy of it was already counted"""
+        url_key, title_key = article_identity(article)
+        day = article.published_ts // 86400
+        # Recurring headlines ("stock falls as ...") only match copies published close together
+        matches = [url_key] + [f"{title_key}:{other}" for other in range(day - TITLE_MATCH_DAYS, day + TITLE_MATCH_DAYS + 1)]
+        seen = self._conn.execute(
+            f"SELECT 1 FROM bucket_members WHERE symbol = ? AND identity IN ({', '.join('?' * len(matches))}) LIMIT 1",
+            (symbol, *matches)
+        ).fetchone()
+        if seen:
+            return
+        self._conn.executemany('INSERT OR IGNORE INTO bucket_members VALUES (?, ?)',
+                               [(symbol, url_key), (symbol, f"{title_key}:{day}")])
+
+        score = article.sentiment_score
+        label = article.sentiment_label
+        for granularity, seconds in BUCKET_SECONDS.items():
+            bucket_start = article.published_ts - article.published_ts % seconds
+            self._conn.execute(
+                """
+                INSERT INTO sentiment_buckets VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?)
+                ON CONFLICT (symbol, granularity, bucket_start) DO UPDATE SET
+                    article_count = article_count + 1,
+                    score_sum = score_sum + excluded.score_sum,
+                    score_sq_sum = score_sq_sum + excluded.score_sq_sum,
+                    positive_count = positive_count + excluded.positive_count,
+                    negative_count = negative_count + excluded.negative_count,
+                    neutral_count = neutral_count + excluded.neutral_count
+                """,
+                (symbol, granularity, bucket_start, score, score * score,
+                 int(label == 'positive'), int(label == 'negative'), int(label == 'neutral'))
+            )
+
+    def get_trend(self, symbol: str, since_ts: int, granularity: str = 'day') -> List[Dict]:
+        """Return the precomputed sentiment rollups for a symbol, oldest bucket first"""
+        if granularity not in BUCKET_SECONDS:
+            raise ValueError(f"Unknown granularity '{granularity}', expected one of {list(BUCKET_SECONDS)}")
+
+        bucket_floor = since_ts - since_ts % BUCKET_SECONDS[granularity]
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT bucket_start, article_count, score_sum, score_sq_sum,
+                       positive_count, negative_count, neutral_count
+                FROM sentiment_buckets
+                WHERE symbol = ? AND granularity = ? AND bucket_start >= ?
+                ORDER BY bucket_start
+                """,
+                (symbol, granularity, bucket_floor)
+            ).fetchall()
+
+        return [
+            {
+                'bucket_start': bucket_start,
+                'article_count': count,
+                'score_sum': score_sum,
+                'score_sq_sum': score_sq_sum,
+                'positive_count': positive,
+                'negative_count': negative,
+                'neutral_count': neutral
+            }
+            for bucket_start, count, score_sum, score_sq_sum, positive, negative, neutral in rows
+        ]
+
+    def load_articles(self, symbol: str, since_ts: int) -> List[NewsArticle]:
+        """Load stored articles for a symbol published at or after since_ts, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT provider, url, title, description, content, published_ts,
+                       source, sentiment_score, sentiment_label
+                FROM articles WHERE symbol = ? AND published_ts >= ?
+                ORDER BY published_ts DESC
+                """,
+                (symbol, since_ts)
+            ).fetchall()
+
+        return [
+            NewsArticle(
+                title=title,
+                description=description or '',
+                content=content or '',
+                url=url,
+                source=source or '',
+                sentiment_score=sentiment_score,
+                sentiment_label=sentiment_label,
+                provider=provider,
+                published_ts=published_ts
+            )
+            for (provider, url, title, description, content, published_ts,
+                 source, sentiment_score, sentiment_label) in rows
+        ]
+
+    def close(self):
+        """Close the underlying SQLite connection"""
+        with self._lock:
+            self._conn.close()
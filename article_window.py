@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Article Window
+Time-ordered article set with prefix sums so any trailing window aggregates in O(log n)
+"""
+
+import time
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+
+class ArticleWindow:
+    """Articles sorted oldest first, with running totals of score, score^2 and labels"""
+
+    def __init__(self, articles: List):
+        self.built_at = time.time()
+        # URL breaks timestamp ties so (published_ts, url) cursors give a stable order
+        self.articles = sorted(articles, key=lambda article: (article.published_ts, article.url))
+        self.timestamps = [article.published_ts for article in self.articles]
+
+        scores = [article.sentiment_score for article in self.articles]
+        labels = [article.sentiment_label for article in self.articles]
+        # Index i holds the total over articles[:i], so any range is one subtraction
+        self._score_sum = [0.0, *accumulate(scores)]
+        self._score_sq_sum = [0.0, *accumulate(score * score for score in scores)]
+        self._positive = [0, *accumulate(label == 'positive' for label in labels)]
+        self._negative = [0, *accumulate(label == 'negative' for label in labels)]
+        self._neutral = [0, *accumulate(label == 'neutral' for label in labels)]
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def start_index(self, since_ts: Optional[int]) -> int:
+        """Index of the oldest article published at or after since_ts"""
+        if since_ts is None:
+            return 0
+        return bisect_left(self.timestamps, since_ts)
+
+    def count_since(self, since_ts: Optional[int]) -> int:
+        return len(self.articles) - self.start_index(since_ts)
+
+    def end_index(self, before: Optional[Tuple[int, str]]) -> int:
+        """Index just past the newest article ordered before a (published_ts, url) cursor"""
+        if before is None:
+            return len(self.articles)
+        published_ts, url = before
+        lo = bisect_left(self.timestamps, published_ts)
+        hi = bisect_right(self.timestamps, published_ts)
+        return bisect_left(self.articles, url, lo, hi, key=lambda article: article.url)
+
+    def articles_since(self, since_ts: Optional[int] = None, limit: Optional[int] = None,
+                       before: Optional[Tuple[int, str]] = None) -> List:
+        """Articles in the window older than the cursor (if any), newest first"""
+        start = self.start_index(since_ts)
+        end = max(start, self.end_index(before))
+        stop = start if limit is None else max(start, end - limit)
+        return self.articles[stop:end][::-1]
+
+    def aggregate(self, since_ts: Optional[int] = None) -> Optional[Dict[str, float]]:
+        """Aggregate sentiment over the trailing window, None when it holds no articles"""
+        start = self.start_index(since_ts)
+        end = len(self.articles)
+        count = end - start
+        if count == 0:
+            return None
+
+        average_sentiment = (self._score_sum[end] - self._score_sum[start]) / count
+        mean_square = (self._score_sq_sum[end] - self._score_sq_sum[start]) / count
+        sentiment_variance = max(0.0, mean_square - average_sentiment ** 2)
+
+        return {
+            'average_sentiment': average_sentiment,
+            'positive_count': self._positive[end] - self._positive[start],
+            'negative_count': self._negative[end] - self._negative[start],
+            'neutral_count': self._neutral[end] - self._neutral[start],
+            'total_articles': count,
+            'sentiment_confidence': max(0, 1 - sentiment_variance)
+        }
@@ -0,0 +1,4 @@
+"""
+Offline benchmarks for the News Sentiment API
+Replays recorded provider responses through a local stub server; run with `python -m benchmarks.run`
+"""
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Benchmark Runner
+Times scrape, score, dedup, aggregate and the Flask endpoints against the stub providers,
+reports throughput and p50/p95/p99 latency, and saves results for run-to-run comparison
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import logging
+import platform
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+SECTIONS = ('scrape', 'score', 'dedup', 'aggregate', 'endpoints')
+DEFAULT_SYMBOLS = 'AAPL,MSFT,GOOGL,AMZN,TSLA,NVDA,META,NFLX'
+
+# Allow `python benchmarks/run.py` as well as `python -m benchmarks.run`
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+@dataclass
+class BenchResult:
+    name: str
+    iterations: int
+    items_per_op: int
+    seconds: float
+    ops_per_sec: float
+    items_per_sec: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def measure(name: str, fn: Callable[[int], None], iterations: int, concurrency: int = 1,
+            setup: Optional[Callable[[int], None]] = None, items: int = 1, warmup: int = 1) -> BenchResult:
+    """Time fn(i) for each iteration; setup(i) runs untimed before each call"""
+    for i in range(warmup):
+        if setup:
+            setup(i)
+        fn(i)
+
+    def timed(i: int) -> float:
+        start = time.perf_counter()
+        fn(i)
+        return time.perf_counter() - start
+
+    latencies = []
+    wall_start = time.perf_counter()
+    if concurrency <= 1:
+        for i in range(iterations):
+            if setup:
+                setup(i)
+            latencies.append(timed(i))
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(timed, range(iterations)))
+    wall = time.perf_counter() - wall_start
+    # Untimed setup is excluded from throughput as well
+    busy = sum(latencies) if concurrency <= 1 else wall
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    return BenchResult(
+        name=name,
+        iterations=iterations,
+        items_per_op=items,
+        seconds=round(busy, 4),
+        ops_per_sec=round(iterations / busy, 2) if busy else 0.0,
+        items_per_sec=round(iterations * items / busy, 2) if busy else 0.0,
+        mean_ms=round(sum(latencies_ms) / len(latencies_ms), 3),
+        p50_ms=round(percentile(latencies_ms, 50), 3),
+        p95_ms=round(percentile(latencies_ms, 95), 3),
+        p99_ms=round(percentile(latencies_ms, 99), 3)
+    )
+
+
+def configure_environment(workdir: str, keep_breakers: bool):
+    """Point every store at a scratch directory and lift provider quotas (read at import time)"""
+    defaults = {
+        'ARTICLE_STORE_PATH': os.path.join(workdir, 'articles.db'),
+        'SENTIMENT_CACHE_BACKEND': 'memory',
+        'SCORE_CACHE_PATH': '',
+        'PREFETCH_WATCHLIST': '',
+        'NEWS_API_KEY': 'benchmark',
+        'POLYGON_API_KEY': 'benchmark',
+        'ALPHA_VANTAGE_KEY': 'benchmark',
+        'NEWSAPI_QUOTA': '1000000/1',
+        # Paid-plan result cap; the developer plan's 100 would stop NewsAPI at its first page
+        'NEWSAPI_MAX_RESULTS': '1000',
+        'ALPHA_VANTAGE_QUOTA': '1000000/1',
+        'POLYGON_QUOTA': '1000000/1'
+    }
+    if not keep_breakers:
+        # Injected errors should cost retries, not silently skip providers for a minute
+        defaults['PROVIDER_BREAKER_FAILURES'] = '1000000'
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class BenchmarkSuite:
+    """Wires the app's scraper to the stub providers and defines each benchmark case"""
+
+    def __init__(self, app_module, stub, fixtures: Dict, symbols: List[str], workdir: str, args):
+        self.app = app_module
+        self.scraper = app_module.news_scraper
+        self.client = app_module.app.test_client()
+        self.stub = stub
+        self.fixtures = fixtures
+        self.symbols = symbols
+        self.workdir = workdir
+        self.args = args
+        self._stores = 0
+
+        for provider, url in stub.provider_urls().items():
+            self.scraper.news_apis[provider]['base_url'] = url
+            self.scraper.news_apis[provider]['enabled'] = True
+
+    def symbol(self, i: int) -> str:
+        return self.symbols[i % len(self.symbols)]
+
+    def fresh_store(self):
+        from article_store import ArticleStore
+        self._stores += 1
+        return ArticleStore(os.path.join(self.workdir, f"articles-{self._stores}.db"))
+
+    def reset(self, keep_store: bool = False, keep_scores: bool = False):
+        """Forget cached windows, responses and (optionally) scores and article history"""
+        from score_cache import ScoreCache
+        from response_cache import MemoryBackend
+        self.scraper._windows.clear()
+        self.app.sentiment_cache.backend = MemoryBackend()
+        if not keep_scores:
+            self.scraper.score_cache = ScoreCache(disk_path='')
+        if not keep_store:
+            if self.scraper.article_store is not None:
+                self.scraper.article_store.close()
+            self.scraper.article_store = self.fresh_store()
+
+    def texts(self) -> List[str]:
+        """Every fixture headline + summary, as the fetchers would score them"""
+        texts = []
+        for by_provider in self.fixtures.values():
+            for provider in ('newsapi', 'polygon'):
+                key = 'articles' if provider == 'newsapi' else 'results'
+                for item in by_provider[provider]['response'].get(key, []):
+                    texts.append(f"{item['title']} {item.get('description', '')}")
+        return texts
+
+    def raw_articles(self) -> List:
+        """Un-deduplicated articles for every symbol, fetched once through the stub"""
+        store = self.scraper.article_store
+        self.scraper.article_store = None
+        try:
+            articles = []
+            for symbol in self.symbols:
+                fetched, _ = self.scraper.fetch_all_providers(symbol, 7)
+                articles.extend(fetched)
+            return articles
+        finally:
+            self.scraper.article_store = store
+
+    def scrape(self) -> List[BenchResult]:
+        iterations = self.args.iterations
+        results = [measure(
+            'scrape.cold', lambda i: self.scraper.get_article_window(self.symbol(i), 7), iterations,
+            setup=lambda i: self.reset()
+        )]
+
+        self.reset()
+        for symbol in self.symbols:
+            self.scraper.get_article_window(symbol, 7)
+        results.append(measure(
+            'scrape.incremental', lambda i: self.scraper.get_article_window(self.symbol(i), 7), iterations,
+            setup=lambda i: self.reset(keep_store=True, keep_scores=True)
+        ))
+        return results
+
+    def score(self) -> List[BenchResult]:
+        texts = self.texts()
+        iterations = max(1, self.args.iterations // 2)
+        results = [measure(
+            'score.batch_uncached', lambda i: self.scraper.calculate_sentiment_batch(texts), iterations,
+            setup=lambda i: self.reset(keep_store=True), items=len(texts)
+        )]
+        results.append(measure(
+            'score.batch_cached', lambda i: self.scraper.calculate_sentiment_batch(texts), iterations, items=len(texts)
+        ))
+        results.append(measure(
+            'score.single_uncached', lambda i: self.scraper._score_text(texts[i % len(texts)]), len(texts)
+        ))
+        results.append(measure(
+            'score.lexicon_batch', lambda i: self.scraper.lexicon_scorer.score_batch(texts), iterations, items=len(texts)
+        ))
+        return results
+
+    def dedup(self) -> List[BenchResult]:
+        articles = self.raw_articles()
+        return [measure(
+            'dedup.all_symbols', lambda i: self.scraper._remove_duplicates(articles), self.args.iterations,
+            items=len(articles)
+        )]
+
+    def aggregate(self) -> List[BenchResult]:
+        from article_window import ArticleWindow
+        articles = self.raw_articles()
+        window = ArticleWindow(articles)
+        since = [int(time.time()) - days * 86400 for days in (1, 7, 30)]
+        iterations = self.args.iterations * 10
+        return [
+            measure('aggregate.full_scan', lambda i: self.scraper.calculate_aggregate_sentiment(articles), iterations,
+                    items=len(articles)),
+            measure('aggregate.window_build', lambda i: ArticleWindow(articles), iterations, items=len(articles)),
+            measure('aggregate.window_slice', lambda i: window.aggregate(since[i % len(since)]), iterations * 10)
+        ]
+
+    def _get(self, path: str):
+        response = self.client.get(path)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} returned {response.status_code}")
+
+    def endpoints(self) -> List[BenchResult]:
+        iterations = self.args.iterations
+        concurrency = self.args.concurrency
+        results = [measure(
+            'endpoint.summary_cold', lambda i: self._get(f"/sentiment/{self.symbol(i)}"), iterations,
+            setup=lambda i: self.reset()
+        )]
+
+        self.reset()
+        for symbol in self.symbols:
+            self._get(f"/sentiment/{symbol}")
+        hot_iterations = iterations * 20
+        results.append(measure(
+            'endpoint.summary_hot', lambda i: self._get(f"/sentiment/{self.symbol(i)}"), hot_iterations,
+            concurrency=concurrency
+        ))
+        results.append(measure(
+            'endpoint.articles_projection',
+            lambda i: self._get(f"/sentiment/{self.symbol(i)}/articles?limit=50&fields=published_at,sentiment_score"),
+            hot_iterations, concurrency=concurrency
+        ))
+        results.append(measure(
+            'endpoint.batch_hot',
+            lambda i: self.client.post('/sentiment/batch', json={'symbols': self.symbols}),
+            iterations, concurrency=concurrency, items=len(self.symbols)
+        ))
+        return results
+
+    def run(self, sections: List[str]) -> List[BenchResult]:
+        results = []
+        for section in sections:
+            print(f"Running {section} benchmarks...")
+            results.extend(getattr(self, section)())
+        return results
+
+
+def print_results(results: List[BenchResult], baseline: Optional[Dict[str, Dict]] = None, threshold: float = 0.1) -> List[str]:
+    """Print a results table, returning the names of cases that regressed against the baseline"""
+    header = f"{'benchmark':<30} {'ops/s':>10} {'items/s':>11} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    if baseline:
+        header += f" {'Δp95':>8} {'Δops/s':>8}"
+    print(header)
+    print('-' * len(header))
+
+    regressions = []
+    for result in results:
+        line = (f"{result.name:<30} {result.ops_per_sec:>10.1f} {result.items_per_sec:>11.1f} "
+                f"{result.p50_ms:>9.2f} {result.p95_ms:>9.2f} {result.p99_ms:>9.2f}")
+        previous = (baseline or {}).get(result.name)
+        if previous:
+            p95_change = (result.p95_ms - previous['p95_ms']) / previous['p95_ms'] if previous['p95_ms'] else 0.0
+            ops_change = (result.ops_per_sec - previous['ops_per_sec']) / previous['ops_per_sec'] if previous['ops_per_sec'] else 0.0
+            line += f" {p95_change:>+8.0%} {ops_change:>+8.0%}"
+            if p95_change > threshold or ops_change < -threshold:
+                regressions.append(result.name)
+                line += '  REGRESSION'
+        print(line)
+    return regressions
+
+
+def load_baseline(value: str, results_dir: Path) -> Optional[Dict[str, Dict]]:
+    """Results of a previous run by path, or the newest saved run for 'latest'"""
+    if value == 'latest':
+        runs = sorted(results_dir.glob('*.json'))
+        if not runs:
+            print("No previous results to compare against")
+            return None
+        path = runs[-1]
+    else:
+        path = Path(value)
+    with open(path) as f:
+        saved = json.load(f)
+    print(f"Comparing against {path} ({saved['meta'].get('git_revision')}, {saved['meta']['timestamp']})")
+    return {result['name']: result for result in saved['results']}
+
+
+def save_results(results: List[BenchResult], meta: Dict, output_dir: Path) -> Path:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(path, 'w') as f:
+        json.dump({'meta': meta, 'results': [asdict(result) for result in results]}, f, indent=2)
+    return path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Offline benchmarks for the News Sentiment API')
+    parser.add_argument('--symbols', default=DEFAULT_SYMBOLS, help='Comma separated symbols to replay')
+    parser.add_argument('--only', default=','.join(SECTIONS), help=f"Sections to run ({', '.join(SECTIONS)})")
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=8, help='Client threads for hot endpoint benchmarks')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Base stub provider latency')
+    parser.add_argument('--jitter-ms', type=float, default=20.0, help='Uniform extra stub latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of provider calls answered 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of provider calls answered 429')
+    parser.add_argument('--keep-breakers', action='store_true', help='Let injected errors trip provider circuit breakers')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quick', action='store_true', help='Small smoke run: 2 symbols, 3 iterations, 5ms latency')
+    parser.add_argument('--output', default=str(RESULTS_DIR), help='Directory for saved results')
+    parser.add_argument('--no-save', action='store_true')
+    parser.add_argument('--compare', help="Previous results file, or 'latest'")
+    parser.add_argument('--threshold', type=float, default=0.1, help='Relative p95/throughput change counted as a regression')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    parser.add_argument('--record', action='store_true', help='Record live provider responses into fixtures and exit')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.symbols = ','.join(args.symbols.split(',')[:2])
+        args.iterations = 3
+        args.latency_ms, args.jitter_ms = 5.0, 2.0
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    symbols = [symbol.strip().upper() for symbol in args.symbols.split(',') if symbol.strip()]
+    sections = [section.strip() for section in args.only.split(',') if section.strip()]
+    unknown = [section for section in sections if section not in SECTIONS]
+    if unknown:
+        print(f"Unknown sections {unknown}, choose from {list(SECTIONS)}")
+        return 2
+
+    from benchmarks import fixtures as fixture_store
+    if args.record:
+        fixture_store.record(symbols)
+        return 0
+
+    workdir = tempfile.mkdtemp(prefix='sentiment-bench-')
+    configure_environment(workdir, args.keep_breakers)
+
+    if not args.verbose:
+        logging.disable(logging.ERROR)
+
+    # Imported after configure_environment: these modules read their settings at import time
+    from benchmarks.stub_server import StubProviderServer
+    import app as app_module
+
+    fixtures = {symbol: fixture_store.load(symbol, args.seed) for symbol in symbols}
+    stub = StubProviderServer(fixtures, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                              error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, seed=args.seed)
+    stub.start()
+
+    baseline = load_baseline(args.compare, Path(args.output)) if args.compare else None
+    try:
+        suite = BenchmarkSuite(app_module, stub, fixtures, symbols, workdir, args)
+        started = time.time()
+        results = suite.run(sections)
+    finally:
+        stub.stop()
+        if app_module.news_scraper.scoring_pool:
+            app_module.news_scraper.scoring_pool.shutdown()
+
+    print()
+    regressions = print_results(results, baseline, args.threshold)
+
+    meta = {
+        'timestamp': datetime.now().isoformat(),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'analyzer': app_module.news_scraper.analyzer_version,
+        'duration_seconds': round(time.time() - started, 2),
+        'symbols': symbols,
+        'synthetic_fixtures': sorted({provider for by_provider in fixtures.values()
+                                      for provider, fixture in by_provider.items() if fixture.get('synthetic')}),
+        'stub': {**stub.stats(), 'latency_ms': args.latency_ms, 'jitter_ms': args.jitter_ms,
+                 'error_rate': args.error_rate, 'rate_limit_rate': args.rate_limit_rate},
+        'iterations': args.iterations,
+        'concurrency': args.concurrency
+    }
+    print(f"\nStub providers served {meta['stub']['requests']} requests "
+          f"({meta['stub']['errors']} errors, {meta['stub']['rate_limited']} rate limited, "
+          f"{meta['stub']['newsapi_follow_up_pages']} NewsAPI follow-up pages)")
+    if not args.no_save:
+        print(f"Results saved to {save_results(results, meta, Path(args.output))}")
+
+    if regressions:
+        print(f"Regressions beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
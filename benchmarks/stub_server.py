@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Stub Provider Server
+Local stand-in for NewsAPI, Alpha Vantage and Polygon that replays fixtures with injected latency and errors
+"""
+
+import json
+import time
+import random
+import threading
+import logging
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs, urlencode
+
+from news_sentiment_scraper import parse_published_at
+
+logger = logging.getLogger(__name__)
+
+# Provider path, item list key and timestamp field/format
+PROVIDER_ROUTES = {
+    '/v2/everything': 'newsapi',
+    '/query': 'alpha_vantage',
+    '/v2/reference/news': 'polygon'
+}
+_TIME_FIELDS = {
+    'newsapi': ('articles', 'publishedAt', '%Y-%m-%dT%H:%M:%SZ'),
+    'alpha_vantage': ('feed', 'time_published', '%Y%m%dT%H%M%S'),
+    'polygon': ('results', 'published_utc', '%Y-%m-%dT%H:%M:%SZ')
+}
+
+
+def _upper_bound(value: str) -> Optional[int]:
+    """Inclusive epoch bound for a provider's "to" filter; a bare date means the end of that day"""
+    if not value:
+        return None
+    if len(value) == 10:
+        return parse_published_at(value) + 86399
+    # Minute-resolution Alpha Vantage bounds cover the whole minute
+    return parse_published_at(value) + (59 if len(value) == 13 else 0)
+
+
+class StubProviderServer:
+    """Threaded HTTP server answering provider API calls from fixtures.
+
+    Fixture timestamps are shifted so the newest recorded article is as old as it
+    was at recording time, keeping date-window filters meaningful on replay.
+    """
+
+    def __init__(self, fixtures: Dict[str, Dict[str, Dict]], latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.newsapi_follow_up_pages = 0
+        self._items = self._index(fixtures)
+        self._server = None
+        self._thread = None
+
+    @staticmethod
+    def _index(fixtures: Dict[str, Dict[str, Dict]]) -> Dict[Tuple[str, str], List[Tuple[int, Dict]]]:
+        """(provider, symbol) -> [(published_ts, item)] newest first, rebased to now"""
+        now = time.time()
+        index = {}
+        for symbol, by_provider in fixtures.items():
+            for provider, fixture in by_provider.items():
+                list_key, field, fmt = _TIME_FIELDS[provider]
+                shift = now - parse_published_at(fixture['recorded_at'])
+                items = []
+                for item in fixture['response'].get(list_key, []):
+                    published_ts = int(parse_published_at(item.get(field, '')) + shift)
+                    item = dict(item)
+                    item[field] = datetime.fromtimestamp(published_ts, tz=timezone.utc).strftime(fmt)
+                    items.append((published_ts, item))
+                index.setdefault((provider, symbol.upper()), []).extend(items)
+                if provider == 'alpha_vantage':
+                    # Also list each story under the other tickers it mentions
+                    for published_ts, item in items:
+                        for entry in item.get('ticker_sentiment', []):
+                            ticker = entry.get('ticker', '').upper()
+                            if ticker and ticker != symbol.upper():
+                                index.setdefault((provider, ticker), []).append((published_ts, item))
+        for items in index.values():
+            items.sort(key=lambda entry: entry[0], reverse=True)
+        return index
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def provider_urls(self) -> Dict[str, str]:
+        """base_url overrides for NewsSentimentScraper.news_apis"""
+        return {provider: self.base_url + path for path, provider in PROVIDER_ROUTES.items()}
+
+    def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                status, body = stub.handle(self.path)
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='stub-providers', daemon=True)
+        self._thread.start()
+        logger.info(f"Stub provider server listening on {self.base_url}")
+        return self.base_url
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {'requests': self.requests, 'errors': self.errors, 'rate_limited': self.rate_limited,
+                    'newsapi_follow_up_pages': self.newsapi_follow_up_pages}
+
+    def _inject(self) -> Optional[Tuple[int, Dict]]:
+        """Sleep for the configured latency, then maybe fail the request"""
+        with self._rng_lock:
+            delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+            roll = self._rng.random()
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        with self._stats_lock:
+            self.requests += 1
+            if roll < self.error_rate:
+                self.errors += 1
+                return 500, {'status': 'error', 'message': 'Injected server error'}
+            if roll < self.error_rate + self.rate_limit_rate:
+                self.rate_limited += 1
+                return 429, {'status': 'error', 'message': 'Injected rate limit'}
+        return None
+
+    def handle(self, raw_path: str) -> Tuple[int, Dict]:
+        parsed = urlparse(raw_path)
+        provider = PROVIDER_ROUTES.get(parsed.path)
+        if provider is None:
+            return 404, {'status': 'error', 'message': f"Unknown path {parsed.path}"}
+
+        failure = self._inject()
+        if failure:
+            return failure
+
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        if provider == 'newsapi':
+            return 200, self._newsapi(params)
+        if provider == 'alpha_vantage':
+            return 200, self._alpha_vantage(params)
+        return 200, self._polygon(params)
+
+    def _select(self, provider: str, symbols: List[str], after_ts: int = 0, inclusive: bool = True,
+                until: str = '') -> List[Dict]:
+        items = []
+        for symbol in symbols:
+            items.extend(self._items.get((provider, symbol.upper()), []))
+        items.sort(key=lambda entry: entry[0], reverse=True)
+        until_ts = _upper_bound(until)
+        return [item for ts, item in items
+                if (ts > after_ts or (inclusive and ts == after_ts)) and (until_ts is None or ts <= until_ts)]
+
+    def _newsapi(self, params: Dict[str, str]) -> Dict:
+        symbol = params.get('q', '').split()[0] if params.get('q') else ''
+        items = self._select('newsapi', [symbol], parse_published_at(params.get('from', '')), until=params.get('to', ''))
+        page_size = int(params.get('pageSize', 100))
+        page = int(params.get('page', 1))
+        if page > 1:
+            with self._stats_lock:
+                self.newsapi_follow_up_pages += 1
+        return {
+            'status': 'ok',
+            'totalResults': len(items),
+            'articles': items[(page - 1) * page_size:page * page_size]
+        }
+
+    def _alpha_vantage(self, params: Dict[str, str]) -> Dict:
+        # Several tickers select articles mentioning all of them; none selects the whole market feed
+        symbols = [symbol.upper() for symbol in params.get('tickers', '').split(',') if symbol]
+        if symbols:
+            candidates = self._select('alpha_vantage', symbols[:1], parse_published_at(params.get('time_from', '')),
+                                      until=params.get('time_to', ''))
+        else:
+            fixture_symbols = sorted({symbol for provider, symbol in self._items if provider == 'alpha_vantage'})
+            candidates = self._select('alpha_vantage', fixture_symbols, parse_published_at(params.get('time_from', '')),
+                                      until=params.get('time_to', ''))
+        items = []
+        seen = set()
+        for item in candidates:
+            mentioned = {entry.get('ticker', '').upper() for entry in item.get('ticker_sentiment', [])}
+            if item.get('url') in seen or not mentioned.issuperset(symbols):
+                continue
+            seen.add(item.get('url'))
+            items.append(item)
+        items = items[:int(params.get('limit', 50))]
+        return {'items': str(len(items)), 'feed': items}
+
+    def _polygon(self, params: Dict[str, str]) -> Dict:
+        if 'published_utc.gt' in params:
+            items = self._select('polygon', [params.get('ticker', '')],
+                                 parse_published_at(params['published_utc.gt']), inclusive=False,
+                                 until=params.get('published_utc.lte', ''))
+        else:
+            items = self._select('polygon', [params.get('ticker', '')],
+                                 parse_published_at(params.get('published_utc.gte', '')),
+                                 until=params.get('published_utc.lte', ''))
+        limit = int(params.get('limit', 10))
+        offset = int(params.get('cursor', 0))
+        page = items[offset:offset + limit]
+
+        response = {'status': 'OK', 'count': len(page), 'results': page}
+        if offset + limit < len(items):
+            next_params = {key: value for key, value in params.items() if key != 'apikey'}
+            next_params['cursor'] = offset + limit
+            response['next_url'] = f"{self.base_url}/v2/reference/news?{urlencode(next_params)}"
+        return response
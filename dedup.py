@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection
+MinHash signatures with LSH banding to cluster syndicated articles in near-linear time
+"""
+
+import os
+import re
+import random
+import hashlib
+import threading
+import logging
+from array import array
+from collections import OrderedDict, defaultdict
+from typing import Callable, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Jaccard similarity (of word shingles) above which two articles are duplicates
+DEDUP_THRESHOLD = float(os.getenv('DEDUP_SIMILARITY_THRESHOLD', '0.5'))
+NUM_PERMUTATIONS = 64
+SHINGLE_SIZE = 2
+# Mersenne prime modulus of the (a*h + b) mod p permutation family
+_MERSENNE_PRIME = (1 << 61) - 1
+# Chance that a pair right at the threshold collides in at least one LSH band
+CANDIDATE_RECALL = 0.95
+# Signatures kept across calls (~600 bytes each); windows are rebuilt from mostly the same articles
+SIGNATURE_CACHE_SIZE = int(os.getenv('DEDUP_SIGNATURE_CACHE_SIZE', '10000'))
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _choose_bands(num_perm: int, threshold: float, recall: float = CANDIDATE_RECALL):
+    """Pick the most selective (bands, rows) that still makes a pair at the threshold a candidate
+    with probability >= recall; candidates are verified exactly, so extra ones only cost time"""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= recall:
+            best = (bands, rows)
+    return best
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Lower-cased word n-grams of a text (single words for very short texts)"""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < size:
+        return set(tokens)
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def jaccard(a: set, b: set) -> float:
+    """Exact Jaccard similarity of two shingle sets"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateDetector:
+    """Clusters texts whose Jaccard similarity meets the threshold.
+
+    MinHash/LSH banding only proposes candidate pairs; each candidate is then
+    checked against the exact Jaccard of the two shingle sets, so the noise of
+    the 64-permutation estimate cannot split or merge clusters.
+    """
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD, num_perm: int = NUM_PERMUTATIONS, seed: int = 1,
+                 cache_size: int = SIGNATURE_CACHE_SIZE):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = _choose_bands(num_perm, threshold)
+        # Affine permutations (a*h + b) mod p are approximately min-wise independent;
+        # XOR masks over a single hash are not and skew the estimate
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)
+        ]
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # text digest -> signature as a compact array
+        self._cache_lock = threading.Lock()
+
+    def signature(self, text: str) -> tuple:
+        """MinHash signature of a text, empty when it has no tokens"""
+        return self._signature(text, shingles(text))
+
+    def _signature(self, text: str, shingle_set: set) -> tuple:
+        key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return tuple(cached)
+
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+            for shingle in shingle_set
+        ]
+        if not hashes:
+            return ()
+        prime = _MERSENNE_PRIME
+        signature = tuple(min([(a * h + b) % prime for h in hashes]) for a, b in self._permutations)
+
+        if self.cache_size:
+            with self._cache_lock:
+                self._cache[key] = array('Q', signature)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return signature
+
+    def similarity(self, sig_a: tuple, sig_b: tuple) -> float:
+        """Estimated Jaccard similarity from two signatures"""
+        if not sig_a or not sig_b:
+            return 0.0
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / self.num_perm
+
+    def cluster(self, texts: Sequence[str]) -> List[List[int]]:
+        """Group text indices into near-duplicate clusters, in order of first appearance"""
+        shingle_sets = [shingles(text) for text in texts]
+        signatures = [self._signature(text, shingle_set) for text, shingle_set in zip(texts, shingle_sets)]
+        parent = list(range(len(texts)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # Only pairs that collide in at least one band are compared
+        for band in range(self.bands):
+            start = band * self.rows
+            buckets = defaultdict(list)
+            for index, sig in enumerate(signatures):
+                if sig:
+                    buckets[sig[start:start + self.rows]].append(index)
+
+            for members in buckets.values():
+                for pos, index in enumerate(members):
+                    for other in members[:pos]:
+                        root_a, root_b = find(other), find(index)
+                        if root_a == root_b:
+                            continue
+                        if jaccard(shingle_sets[other], shingle_sets[index]) >= self.threshold:
+                            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        clusters = defaultdict(list)
+        for index in range(len(texts)):
+            clusters[find(index)].append(index)
+        return sorted(clusters.values(), key=lambda members: members[0])
+
+    def dedupe(self, items: Sequence, text_fn: Callable, rank_fn: Callable) -> List:
+        """Keep the highest-ranked item of each near-duplicate cluster, in first-seen order"""
+        clusters = self.cluster([text_fn(item) for item in items])
+        return [max((items[i] for i in members), key=rank_fn) for members in clusters]
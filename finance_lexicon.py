@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Finance Lexicon
+Single-pass, trie-compiled sentiment scorer for market news with negation and booster handling
+"""
+
+import re
+import math
+from typing import Dict, List, Optional, Tuple
+
+# Valences on VADER's -4..4 scale so compound scores are comparable
+FINANCE_LEXICON = {
+    # Results and guidance
+    'beat': 1.8, 'beats': 1.8, 'beat estimates': 2.4, 'beats estimates': 2.4, 'beat expectations': 2.4,
+    'beats expectations': 2.4, 'tops estimates': 2.3, 'topped estimates': 2.3, 'exceeded expectations': 2.4,
+    'miss': -1.8, 'misses': -1.8, 'missed': -1.8, 'missed estimates': -2.4, 'misses estimates': -2.4,
+    'missed expectations': -2.4, 'falls short': -2.0, 'fell short': -2.0,
+    'raises guidance': 2.4, 'raised guidance': 2.4, 'raises outlook': 2.3, 'raised outlook': 2.3,
+    'cuts guidance': -2.4, 'cut guidance': -2.4, 'lowers guidance': -2.4, 'lowered guidance': -2.4,
+    'cuts outlook': -2.3, 'lowered outlook': -2.3, 'warns': -1.6, 'warning': -1.4, 'profit warning': -2.6,
+    'record revenue': 2.4, 'record profit': 2.5, 'record high': 2.0, 'record low': -2.0, 'record loss': -2.6,
+    'strong': 1.4, 'stronger': 1.4, 'solid': 1.1, 'robust': 1.4, 'weak': -1.5, 'weaker': -1.5, 'soft': -0.8,
+    'softer': -0.9, 'disappointing': -2.0, 'disappoints': -2.0, 'disappointed': -1.9,
+    'growth': 1.2, 'grows': 1.2, 'grew': 1.2, 'expands': 1.0, 'expansion': 1.0,
+    'profit': 1.2, 'profitable': 1.5, 'profitability': 1.1, 'loss': -1.5, 'losses': -1.5, 'net loss': -2.0,
+    'revenue decline': -1.9, 'sales decline': -1.9, 'margin pressure': -1.7, 'slowing demand': -1.8,
+    # Price action
+    'surge': 2.0, 'surges': 2.0, 'surged': 2.0, 'soar': 2.2, 'soars': 2.2, 'soared': 2.2,
+    'jump': 1.5, 'jumps': 1.5, 'jumped': 1.5, 'rally': 1.7, 'rallies': 1.7, 'rallied': 1.7,
+    'rise': 1.0, 'rises': 1.0, 'rose': 1.0, 'gain': 1.1, 'gains': 1.1, 'gained': 1.1,
+    'climb': 1.1, 'climbs': 1.1, 'climbed': 1.1, 'rebound': 1.3, 'rebounds': 1.3, 'rebounded': 1.3,
+    'all time high': 2.1, 'fall': -1.0, 'falls': -1.0, 'fell': -1.0, 'drop': -1.1, 'drops': -1.1,
+    'dropped': -1.1, 'decline': -1.1, 'declines': -1.1, 'declined': -1.1, 'slide': -1.2, 'slides': -1.2,
+    'slid': -1.2, 'slump': -1.8, 'slumps': -1.8, 'slumped': -1.8, 'plunge': -2.3, 'plunges': -2.3,
+    'plunged': -2.3, 'tumble': -2.0, 'tumbles': -2.0, 'tumbled': -2.0, 'sink': -1.5, 'sinks': -1.5,
+    'sank': -1.5, 'crash': -2.8, 'crashes': -2.8, 'crashed': -2.8, 'selloff': -2.0, 'sell off': -2.0,
+    # Analysts and investors
+    'upgrade': 1.9, 'upgrades': 1.9, 'upgraded': 1.9, 'downgrade': -1.9, 'downgrades': -1.9, 'downgraded': -1.9,
+    'outperform': 1.6, 'overweight': 1.3, 'buy rating': 1.6, 'underperform': -1.6, 'underweight': -1.3,
+    'sell rating': -1.6, 'price target raised': 1.8, 'raises price target': 1.8, 'price target cut': -1.8,
+    'cuts price target': -1.8, 'bullish': 2.0, 'bearish': -2.0, 'optimistic': 1.6, 'optimism': 1.5,
+    'pessimistic': -1.6, 'confidence': 1.0, 'worry': -1.3, 'worries': -1.3, 'concern': -1.1, 'concerns': -1.2,
+    'fears': -1.5, 'uncertainty': -1.2, 'volatile': -0.8, 'volatility': -0.7, 'short sellers': -1.0,
+    # Corporate actions
+    'buyback': 1.3, 'share buyback': 1.5, 'dividend hike': 1.8, 'raises dividend': 1.8, 'dividend cut': -2.0,
+    'cuts dividend': -2.0, 'dividend suspended': -2.4, 'partnership': 1.0, 'partners': 0.7, 'deal': 0.6,
+    'acquisition': 0.5, 'merger': 0.4, 'breakthrough': 2.0, 'approval': 1.4, 'approved': 1.3,
+    'layoffs': -1.6, 'cuts jobs': -1.5, 'job cuts': -1.5, 'restructuring': -0.9, 'recall': -1.6,
+    'bankruptcy': -3.2, 'bankrupt': -3.2, 'default': -2.4, 'defaults': -2.4, 'delisted': -2.6,
+    'lawsuit': -1.6, 'sued': -1.6, 'probe': -1.5, 'investigation': -1.5, 'fraud': -3.0, 'scandal': -2.6,
+    'fined': -1.6, 'penalty': -1.5, 'regulatory probe': -1.9, 'antitrust': -1.2,
+    'downturn': -1.7, 'recession': -2.2, 'inflation': -0.8, 'headwinds': -1.4, 'tailwinds': 1.4,
+    'outage': -1.5, 'breach': -2.0, 'hack': -2.0, 'shortage': -1.3, 'supply chain risks': -1.5,
+    # General tone
+    'good': 1.9, 'great': 3.1, 'excellent': 2.7, 'positive': 2.2, 'success': 2.0, 'successful': 2.1,
+    'bad': -2.5, 'terrible': -2.9, 'negative': -2.1, 'failure': -2.4, 'fails': -1.8, 'failed': -1.9,
+    'risk': -0.8, 'risks': -0.8, 'upside': 1.3, 'downside': -1.3, 'win': 1.6, 'wins': 1.6, 'won': 1.5,
+}
+
+# Words that flip the valence of a match within NEGATION_WINDOW tokens before it
+NEGATIONS = frozenset([
+    'not', 'no', 'never', 'without', 'neither', 'nor', 'cannot', 'cant', 'wont', 'dont', 'didnt',
+    'doesnt', 'isnt', 'wasnt', 'arent', 'werent', 'hasnt', 'havent', 'hardly', 'barely'
+])
+NEGATION_WINDOW = 3
+NEGATION_SCALAR = -0.74  # VADER's damped flip
+
+# Intensity modifiers applying to the next match within BOOSTER_WINDOW tokens
+BOOSTERS = {
+    'sharply': 0.3, 'significantly': 0.3, 'strongly': 0.25, 'sharp': 0.25, 'huge': 0.3, 'massive': 0.3,
+    'very': 0.25, 'deeply': 0.25, 'slightly': -0.3, 'modestly': -0.25, 'marginally': -0.3, 'somewhat': -0.2
+}
+BOOSTER_WINDOW = 2
+
+NORMALIZATION_ALPHA = 15  # Same squashing as VADER's compound score
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_END = None  # Trie key marking the end of a phrase
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with apostrophes dropped ("isn't" -> "isnt")"""
+    return [token.replace("'", '') for token in _TOKEN_RE.findall(text.lower())]
+
+
+def compile_trie(lexicon: Dict[str, float]) -> Dict:
+    """Nested token -> node dicts; a node's _END entry holds the phrase valence"""
+    trie = {}
+    for phrase, valence in lexicon.items():
+        node = trie
+        for token in tokenize(phrase):
+            node = node.setdefault(token, {})
+        node[_END] = valence
+    return trie
+
+
+class LexiconScorer:
+    """Scores text against a compiled phrase lexicon in one left-to-right pass over its tokens.
+
+    Drop-in for VADER's polarity_scores(): returns compound, pos, neu and neg.
+    Longest phrases win ("price target cut" over "cut"), so tokens are never
+    counted twice and substrings inside other words never match.
+    """
+
+    version = 'finance-lexicon-1'
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None):
+        self.trie = compile_trie(FINANCE_LEXICON if lexicon is None else lexicon)
+
+    def _matches(self, tokens: List[str]) -> List[Tuple[int, int, float]]:
+        """(start, end, valence) of each longest phrase match, left to right"""
+        trie = self.trie
+        matches = []
+        i = 0
+        count = len(tokens)
+        while i < count:
+            node = trie.get(tokens[i])
+            if node is None:
+                i += 1
+                continue
+            end, valence = (i + 1, node[_END]) if _END in node else (None, None)
+            j = i + 1
+            while j < count:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    end, valence = j, node[_END]
+            if end is None:
+                i += 1
+                continue
+            matches.append((i, end, valence))
+            i = end
+        return matches
+
+    def polarity_scores(self, text: str) -> Dict[str, float]:
+        tokens = tokenize(text)
+        if not tokens:
+            return {'compound': 0.0, 'pos': 0.0, 'neu': 1.0, 'neg': 0.0}
+
+        positive = negative = 0.0
+        matched_tokens = 0
+        for start, end, valence in self._matches(tokens):
+            matched_tokens += end - start
+            for token in tokens[max(0, start - BOOSTER_WINDOW):start]:
+                boost = BOOSTERS.get(token)
+                if boost:
+                    valence += boost if valence > 0 else -boost
+            if any(token in NEGATIONS for token in tokens[max(0, start - NEGATION_WINDOW):start]):
+                valence *= NEGATION_SCALAR
+            if valence > 0:
+                positive += valence
+            else:
+                negative -= valence
+
+        total = positive - negative
+        compound = total / math.sqrt(total * total + NORMALIZATION_ALPHA) if total else 0.0
+        # Unmatched tokens count as neutral mass, as in VADER's proportions
+        neutral = float(len(tokens) - matched_tokens)
+        mass = positive + negative + neutral
+        return {
+            'compound': round(max(-1.0, min(1.0, compound)), 4),
+            'pos': round(positive / mass, 3),
+            'neu': round(neutral / mass, 3),
+            'neg': round(negative / mass, 3)
+        }
+
+    def score_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Score many texts in-process; cheap enough to run on the request thread"""
+        return [self.polarity_scores(text) for text in texts]
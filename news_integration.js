@@ -8,6 +8,8 @@ class NewsSentimentIntegration {
         this.isUpdating = false;
         this.newsData = {};
         this.sentimentHistory = {};
+        this.eventSource = null; // Server push subscription, when supported
+        this.subscribedSymbols = '';
         
         // Initialize the integration
         this.initialize();
@@ -26,8 +28,8 @@ class NewsSentimentIntegration {
             this.useSimulatedData = false;
         }
 
-        // Start periodic updates
-        this.startPeriodicUpdates();
+        // Prefer server push, fall back to polling
+        this.startUpdates();
         
         // Wait a bit before first update to let the initial visualization settle
         setTimeout(() => {
@@ -269,6 +271,74 @@ class NewsSentimentIntegration {
         console.log(`📊 Updated ${stock.name}: sentiment=${blendedSentiment.toFixed(3)}, trend=${stock.sentiment.trend}`);
     }
 
+    startUpdates() {
+        if (!this.useSimulatedData && typeof EventSource !== 'undefined') {
+            this.startPushUpdates();
+        } else {
+            this.startPeriodicUpdates();
+        }
+    }
+
+    startPushUpdates() {
+        this.subscribeToActiveStocks();
+
+        // Only re-subscribe when the set of active stocks changes; this makes no API requests
+        if (this.subscriptionCheckId) {
+            clearInterval(this.subscriptionCheckId);
+        }
+        this.subscriptionCheckId = setInterval(() => {
+            this.subscribeToActiveStocks();
+        }, this.updateInterval);
+    }
+
+    subscribeToActiveStocks() {
+        const symbols = getActiveStocks().map(stock => stock.name).sort().join(',');
+        if (!symbols || (symbols === this.subscribedSymbols && this.eventSource)) return;
+
+        if (this.eventSource) {
+            this.eventSource.close();
+        }
+        this.subscribedSymbols = symbols;
+
+        console.log(`📡 Subscribing to sentiment changes for ${symbols}`);
+        this.eventSource = new EventSource(`${this.apiBaseUrl}/sentiment/subscribe?symbols=${encodeURIComponent(symbols)}`);
+
+        this.eventSource.addEventListener('sentiment', (event) => {
+            const update = JSON.parse(event.data);
+            this.newsData[update.symbol] = update.data;
+
+            const stock = getActiveStocks().find(s => s.name === update.symbol);
+            if (stock) {
+                this.updateStockWithNewsSentiment(stock, update.data);
+                if (typeof updateUI === 'function') {
+                    updateUI();
+                }
+                this.updateVisualizationColors();
+            }
+        });
+
+        this.eventSource.onerror = () => {
+            // EventSource retries on its own; only give up once the browser has closed it
+            if (this.eventSource && this.eventSource.readyState === EventSource.CLOSED) {
+                console.warn('⚠️ Sentiment push closed, falling back to polling');
+                this.stopPushUpdates();
+                this.startPeriodicUpdates();
+            }
+        };
+    }
+
+    stopPushUpdates() {
+        if (this.subscriptionCheckId) {
+            clearInterval(this.subscriptionCheckId);
+            this.subscriptionCheckId = null;
+        }
+        if (this.eventSource) {
+            this.eventSource.close();
+            this.eventSource = null;
+            this.subscribedSymbols = '';
+        }
+    }
+
     startPeriodicUpdates() {
         // Clear any existing interval
         if (this.updateIntervalId) {
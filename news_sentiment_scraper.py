@@ -5,34 +5,150 @@ Fetches news from multiple APIs and calculates sentiment scores
 """
 
 import os
+import sys
 import json
 import time
-import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+import math
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, wait
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 import logging
+import threading
+from collections import OrderedDict
+
+from http_sessions import build_session, session_stats, POOL_SIZE
+from score_cache import ScoreCache, make_score_key
+from scoring_pool import ScoringPool
+from provider_quota import ProviderQuota, ProviderUnavailable
+from dedup import NearDuplicateDetector, DEDUP_THRESHOLD
+from finance_lexicon import LexiconScorer
+from article_window import ArticleWindow
+from ticker_index import TickerIndex
+from metrics import REGISTRY
+from tracing import span, propagate
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Overall deadline (seconds) for one fan-out across all providers
+FETCH_DEADLINE = float(os.getenv('NEWS_FETCH_DEADLINE', '12'))
+# Provider calls in flight across all symbols (batch requests fan out many symbols at once)
+FETCH_WORKERS = int(os.getenv('NEWS_FETCH_WORKERS', '32'))
+# Per-symbol superset window: how long it is reused, how far back it may grow, how many symbols are kept
+WINDOW_TTL = float(os.getenv('NEWS_WINDOW_TTL', '30'))
+WINDOW_MAX_DAYS = int(os.getenv('NEWS_WINDOW_MAX_DAYS', '30'))
+WINDOW_MAX_SYMBOLS = int(os.getenv('NEWS_WINDOW_MAX_SYMBOLS', '500'))
+# Result pages per provider fetch, overridable per symbol with e.g. NEWS_PAGE_BUDGETS="AAPL:10,TSLA:8"
+MAX_PAGES = int(os.getenv('NEWS_MAX_PAGES', '5'))
+PAGE_CONCURRENCY = int(os.getenv('NEWS_PAGE_CONCURRENCY', '3'))
+PAGE_WORKERS = int(os.getenv('NEWS_PAGE_WORKERS', '16'))
+# NewsAPI's developer plan serves at most 100 results per query; raise on paid plans
+NEWSAPI_MAX_RESULTS = int(os.getenv('NEWSAPI_MAX_RESULTS', '100'))
+NEWSAPI_PAGE_SIZE = 100
+POLYGON_PAGE_SIZE = 50
+ALPHA_VANTAGE_PAGE_SIZE = 50
+ALPHA_VANTAGE_MAX_LIMIT = 1000
+# How long indexed Alpha Vantage results answer without a call; also the market-wide feed refresh interval
+ALPHA_VANTAGE_FEED_TTL = float(os.getenv('ALPHA_VANTAGE_FEED_TTL', '60'))
+# Primary scoring engine: vader, or lexicon for the compiled finance lexicon only
+SENTIMENT_ENGINE = os.getenv('SENTIMENT_ENGINE', 'vader').lower()
+
+PROVIDER_LATENCY = REGISTRY.histogram(
+    'news_provider_request_seconds', 'Provider API call latency including retries', ('provider', 'outcome'))
+PROVIDER_SKIPPED = REGISTRY.counter(
+    'news_provider_skipped_total', 'Provider fetches not attempted or abandoned at the deadline', ('provider', 'reason'))
+ARTICLES_INGESTED = REGISTRY.counter(
+    'news_articles_ingested_total', 'Articles returned by provider fetches (only new ones when incremental)', ('provider',))
+SCORING_SECONDS = REGISTRY.histogram(
+    'sentiment_scoring_seconds', 'Time to score one batch of score-cache misses', ('path',))
+ALPHA_VANTAGE_LOOKUPS = REGISTRY.counter(
+    'news_alpha_vantage_lookups_total', 'Alpha Vantage symbol fetches by what answered them', ('source',))
+SCORED_TEXTS = REGISTRY.counter(
+    'sentiment_scored_texts_total', 'Texts scored after missing the score cache', ('path',))
+
+@dataclass(slots=True)
 class NewsArticle:
-    """Data class for news articles"""
+    """Compact news article: epoch timestamp, interned source, float sentiment"""
     title: str
     description: str
     content: str
     url: str
-    published_at: str
+    published_ts: int
     source: str
     sentiment_score: float = 0.0
     sentiment_label: str = "neutral"
+    provider: str = ""
+
+    def __post_init__(self):
+        # Sources, providers and labels repeat across thousands of articles
+        self.source = sys.intern(self.source or '')
+        self.provider = sys.intern(self.provider)
+        self.sentiment_label = sys.intern(self.sentiment_label)
+        self.sentiment_score = float(self.sentiment_score)
+        self.published_ts = int(self.published_ts)
+
+    @property
+    def published_at(self) -> str:
+        """Publication time as an ISO-8601 UTC string"""
+        return datetime.fromtimestamp(self.published_ts, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+class FetchedArticles(list):
+    """Articles from one provider fetch; complete is False when the page budget, a result
+    cap or a failed page stopped it before it reached back to the requested start.
+    An empty, incomplete result is a failed fetch, not an empty range."""
+
+    def __init__(self, articles=(), complete: bool = True):
+        super().__init__(articles)
+        self.complete = complete
+
+def parse_published_at(value: str) -> int:
+    """Parse a provider timestamp into epoch seconds (UTC), 0 when unparseable"""
+    if not value:
+        return 0
+    
+    # Alpha Vantage uses a compact 20240101T120000 format
+    for fmt in ('%Y%m%dT%H%M%S', '%Y%m%dT%H%M'):
+        try:
+            return int(datetime.strptime(value, fmt).replace(tzinfo=timezone.utc).timestamp())
+        except ValueError:
+            pass
+    
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return 0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+def _format_since(since: int, fmt: str) -> str:
+    """Format an epoch watermark for a provider's date filter"""
+    return datetime.fromtimestamp(since, tz=timezone.utc).strftime(fmt)
+
+def _window_start(days_back: int) -> int:
+    """Epoch second at which a trailing days_back window begins"""
+    return int(time.time()) - days_back * 86400
+
+def parse_page_budgets(value: str) -> Dict[str, int]:
+    """Parse "AAPL:10,TSLA:8" into {'AAPL': 10, 'TSLA': 8}"""
+    budgets = {}
+    for item in value.split(','):
+        symbol, _, pages = item.strip().partition(':')
+        if symbol and pages:
+            budgets[symbol.upper()] = int(pages)
+    return budgets
+
+def _reached_cutoff(items: List[Dict], field: str, cutoff: int) -> bool:
+    """True when a newest-first page already reaches back to the cutoff"""
+    return bool(items) and parse_published_at(items[-1].get(field, '')) <= cutoff
 
 class NewsSentimentScraper:
     """Main class for scraping news and calculating sentiment"""
     
-    def __init__(self):
+    def __init__(self, concurrent_fetch: Optional[bool] = None, fetch_deadline: Optional[float] = None,
+                 pool_size: int = POOL_SIZE, article_store=None, dedup_threshold: float = DEDUP_THRESHOLD):
         self.news_apis = {
             'newsapi': {
                 'base_url': 'https://newsapi.org/v2/everything',
@@ -51,47 +167,156 @@ class NewsSentimentScraper:
             }
         }
         
+        # Finance lexicon scorer: the fallback engine, and the first pass when the scoring pool is saturated and scores are not persisted
+        self.lexicon_scorer = LexiconScorer()
+        
         # Initialize sentiment analyzer
+        self.sentiment_analyzer = None
+        self.analyzer_version = self.lexicon_scorer.version
+        if SENTIMENT_ENGINE == 'vader':
+            try:
+                from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+                self.sentiment_analyzer = SentimentIntensityAnalyzer()
+                self.analyzer_version = 'vader-3.3.2'
+                logger.info("VADER sentiment analyzer initialized successfully")
+            except ImportError:
+                logger.warning("VADER sentiment analyzer not available. Install with: pip install vaderSentiment")
+
+        # Memoized scores keyed by text hash + analyzer version
+        self.score_cache = ScoreCache()
+
+        # Worker processes for batch scoring, only useful when VADER is available
+        self.scoring_pool = ScoringPool() if self.sentiment_analyzer else None
+
+        # Provider fan-out: run all enabled providers in parallel under one deadline
+        if concurrent_fetch is None:
+            concurrent_fetch = os.getenv('NEWS_CONCURRENT_FETCH', 'true').lower() == 'true'
+        self.concurrent_fetch = concurrent_fetch
+        self.fetch_deadline = fetch_deadline if fetch_deadline is not None else FETCH_DEADLINE
+        self._fetch_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='news-fetch')
+        # Separate pool for follow-up pages so provider fetches never wait on their own executor
+        self._page_executor = ThreadPoolExecutor(max_workers=PAGE_WORKERS, thread_name_prefix='news-page')
+        self.page_budgets = parse_page_budgets(os.getenv('NEWS_PAGE_BUDGETS', ''))
+        self.window_ttl = WINDOW_TTL
+
+        # One pooled keep-alive session per provider
+        self.sessions = {name: build_session(pool_size=pool_size) for name in self.news_apis}
+
+        # MinHash/LSH clustering of syndicated stories across providers
+        self.dedup = NearDuplicateDetector(threshold=dedup_threshold)
+
+        # One time-ordered superset of articles per symbol; smaller days-windows are sliced from it
+        self._windows = OrderedDict()  # symbol -> (built_at, days_covered, ArticleWindow, provider_status)
+        self._window_locks = {}
+        self._windows_lock = threading.Lock()
+
+        # Token buckets and circuit breakers so exhausted providers are not called at all
+        self.quota = ProviderQuota(self.news_apis.keys())
+
+        # Alpha Vantage articles under every ticker they mention, so one call feeds many symbols
+        self.ticker_index = TickerIndex(self.get_sentiment_label)
+        self._feed_lock = threading.Lock()
+        
+        # Optional ArticleStore: refreshes then only fetch and score articles past the watermark
+        self.article_store = article_store
+
+    def _provider_get(self, provider: str, params: Dict, url: Optional[str] = None) -> Dict:
+        """GET a provider endpoint over its pooled session and decode the JSON body.
+        
+        Spends one quota token and feeds the provider's circuit breaker; raises
+        ProviderUnavailable without any network call when the provider is exhausted.
+        """
+        self.quota.acquire(provider)
+        started = time.perf_counter()
         try:
-            from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-            self.sentiment_analyzer = SentimentIntensityAnalyzer()
-            logger.info("VADER sentiment analyzer initialized successfully")
-        except ImportError:
-            logger.warning("VADER sentiment analyzer not available. Install with: pip install vaderSentiment")
-            self.sentiment_analyzer = None
+            response = self.sessions[provider].get(url or self.news_apis[provider]['base_url'], params=params, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            rate_limited = getattr(getattr(e, 'response', None), 'status_code', None) == 429
+            self.quota.record_failure(provider, rate_limited=rate_limited)
+            PROVIDER_LATENCY.observe(time.perf_counter() - started, provider, 'rate_limited' if rate_limited else 'error')
+            raise
+        
+        # Alpha Vantage reports rate limiting as a 200 with a Note/Information message
+        if provider == 'alpha_vantage' and 'feed' not in data and ('Note' in data or 'Information' in data):
+            self.quota.record_failure(provider, rate_limited=True)
+            PROVIDER_LATENCY.observe(time.perf_counter() - started, provider, 'rate_limited')
+            raise ProviderUnavailable(provider, 'rate_limited')
+        
+        self.quota.record_success(provider)
+        PROVIDER_LATENCY.observe(time.perf_counter() - started, provider, 'ok')
+        return data
+
+    def http_stats(self) -> Dict[str, Dict[str, int]]:
+        """Connection reuse counts for each provider session"""
+        return {name: session_stats(session) for name, session in self.sessions.items()}
 
     def calculate_sentiment(self, text: str) -> Dict[str, float]:
-        """Calculate sentiment score using VADER"""
-        if not self.sentiment_analyzer:
-            # Fallback simple sentiment calculation
-            return self._simple_sentiment(text)
+        """Calculate sentiment score using VADER, memoized on the text hash"""
+        key = make_score_key(text, self.analyzer_version)
+        cached = self.score_cache.get(key)
+        if cached is not None:
+            return cached
         
-        scores = self.sentiment_analyzer.polarity_scores(text)
+        scores = self._score_text(text)
+        self.score_cache.put(key, scores)
         return scores
 
-    def _simple_sentiment(self, text: str) -> Dict[str, float]:
-        """Simple fallback sentiment calculation"""
-        positive_words = ['good', 'great', 'excellent', 'positive', 'bullish', 'up', 'rise', 'gain', 'profit', 'success']
-        negative_words = ['bad', 'terrible', 'negative', 'bearish', 'down', 'fall', 'loss', 'decline', 'failure', 'crash']
-        
-        text_lower = text.lower()
-        pos_count = sum(1 for word in positive_words if word in text_lower)
-        neg_count = sum(1 for word in negative_words if word in text_lower)
+    def calculate_sentiment_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Score a list of texts, sending cache misses to the scoring pool in one batch"""
+        keys = [make_score_key(text, self.analyzer_version) for text in texts]
+        results = [self.score_cache.get(key) for key in keys]
         
-        total_words = len(text.split())
-        if total_words == 0:
-            return {'compound': 0.0, 'pos': 0.0, 'neu': 1.0, 'neg': 0.0}
+        # Score each distinct missing text once, even if it repeats within the batch
+        missing = {}
+        for key, text, scores in zip(keys, texts, results):
+            if scores is None and key not in missing:
+                missing[key] = text
         
-        pos_score = pos_count / total_words
-        neg_score = neg_count / total_words
-        compound = pos_score - neg_score
+        if missing:
+            miss_texts = list(missing.values())
+            pool = self.scoring_pool
+            started = time.perf_counter()
+            path = 'inline'
+            with span('score'):
+                # The article store persists scores and never rescores them, so with a store
+                # attached a first pass would become the article's permanent score
+                first_pass_ok = self.article_store is None
+                if pool and pool.enabled and len(miss_texts) >= pool.min_batch and pool.saturated and first_pass_ok:
+                    # Don't queue behind other batches; the lexicon pass is ~5x cheaper than VADER inline
+                    miss_scores = self.lexicon_scorer.score_batch(miss_texts)
+                    path = 'lexicon'
+                elif pool and pool.enabled and len(miss_texts) >= pool.min_batch:
+                    try:
+                        miss_scores = pool.score(miss_texts)
+                        path = 'pool'
+                    except Exception as e:
+                        logger.error(f"Scoring pool failed, scoring inline: {e}")
+                        miss_scores = [self._score_text(text) for text in miss_texts]
+                else:
+                    miss_scores = [self._score_text(text) for text in miss_texts]
+            SCORING_SECONDS.observe(time.perf_counter() - started, path)
+            SCORED_TEXTS.inc(len(miss_texts), path)
+            
+            scored = dict(zip(missing.keys(), miss_scores))
+            # First-pass lexicon scores are not cached, so the texts get full scores next time
+            if path != 'lexicon':
+                for key, scores in scored.items():
+                    self.score_cache.put(key, scores)
+            results = [scores if scores is not None else scored[key] for key, scores in zip(keys, results)]
         
-        return {
-            'compound': compound,
-            'pos': pos_score,
-            'neu': 1.0 - pos_score - neg_score,
-            'neg': neg_score
-        }
+        return results
+
+    def _score_text(self, text: str) -> Dict[str, float]:
+        """Score one text with VADER or the fallback, bypassing the cache"""
+        if not self.sentiment_analyzer:
+            return self._simple_sentiment(text)
+        return self.sentiment_analyzer.polarity_scores(text)
+
+    def _simple_sentiment(self, text: str) -> Dict[str, float]:
+        """Fallback sentiment from the compiled finance lexicon"""
+        return self.lexicon_scorer.polarity_scores(text)
 
     def get_sentiment_label(self, compound_score: float) -> str:
         """Convert compound score to sentiment label"""
@@ -102,8 +327,58 @@ class NewsSentimentScraper:
         else:
             return "neutral"
 
-    def fetch_newsapi_news(self, query: str, days_back: int = 7) -> List[NewsArticle]:
-        """Fetch news from NewsAPI"""
+    def page_budget(self, symbol: str) -> int:
+        """Maximum result pages to request per provider for a symbol"""
+        return self.page_budgets.get(symbol.upper(), MAX_PAGES)
+
+    def _newsapi_pages(self, params: Dict, budget: int, cutoff: int) -> Tuple[List[Dict], bool]:
+        """NewsAPI results across pages, later pages fetched concurrently in waves.
+        
+        Stops at the page budget, the plan's result cap, a short page, or a page
+        reaching back past the cutoff. Failures after the first page keep what was
+        fetched. Also returns whether the results reach back to the cutoff.
+        """
+        first = self._provider_get('newsapi', {**params, 'page': 1})
+        if first.get('status') != 'ok':
+            logger.warning(f"NewsAPI returned {first.get('status')} for {params['q']}: {first.get('message')}")
+            return [], False
+        items = list(first.get('articles', []))
+        
+        page_size = params['pageSize']
+        total = first.get('totalResults', 0)
+        available = min(total, NEWSAPI_MAX_RESULTS)
+        last_page = min(budget, math.ceil(available / page_size))
+        done = complete = len(items) < page_size or _reached_cutoff(items, 'publishedAt', cutoff)
+        next_page = 2
+        
+        while not done and next_page <= last_page:
+            wave = range(next_page, min(last_page, next_page + PAGE_CONCURRENCY - 1) + 1)
+            futures = [
+                self._page_executor.submit(propagate(self._provider_get), 'newsapi', {**params, 'page': page})
+                for page in wave
+            ]
+            # Consume in page order so a stop condition discards only later pages
+            for future in futures:
+                try:
+                    page_items = future.result().get('articles', [])
+                except Exception as e:
+                    logger.warning(f"Stopped NewsAPI paging for {params['q']}: {e}")
+                    done = True
+                    break
+                items.extend(page_items)
+                if len(page_items) < page_size or _reached_cutoff(page_items, 'publishedAt', cutoff):
+                    done = complete = True
+                    break
+            if done:
+                for future in futures:
+                    future.cancel()
+            next_page = wave[-1] + 1
+        
+        return items, complete or len(items) >= total
+
+    def fetch_newsapi_news(self, query: str, days_back: int = 7, since: Optional[int] = None,
+                           page_budget: int = MAX_PAGES, until: Optional[int] = None) -> List[NewsArticle]:
+        """Fetch news from NewsAPI, only articles newer than `since` and not after `until` (epoch) when given"""
         if not self.news_apis['newsapi']['enabled']:
             return []
         
@@ -119,100 +394,219 @@ class NewsSentimentScraper:
             
             params = {
                 'q': query,
-                'from': from_date.strftime('%Y-%m-%d'),
-                'to': to_date.strftime('%Y-%m-%d'),
+                'from': _format_since(since, '%Y-%m-%dT%H:%M:%S') if since else from_date.strftime('%Y-%m-%d'),
+                'to': _format_since(until, '%Y-%m-%dT%H:%M:%S') if until else to_date.strftime('%Y-%m-%d'),
                 'sortBy': 'publishedAt',
                 'language': 'en',
-                'pageSize': 50,
+                'pageSize': NEWSAPI_PAGE_SIZE,
                 'apiKey': api_key
             }
             
-            response = requests.get(self.news_apis['newsapi']['base_url'], params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            articles = []
+            results, complete = self._newsapi_pages(params, page_budget, since or _window_start(days_back))
+            articles = FetchedArticles(complete=complete)
+            fetched_at = int(time.time())  # Stands in for missing or unparseable timestamps
             
-            if data.get('status') == 'ok':
-                for article_data in data.get('articles', []):
+            if results:
+                page = []
+                for article_data in results:
                     if article_data.get('title') and article_data.get('description'):
-                        # Combine title and description for sentiment analysis
-                        full_text = f"{article_data['title']} {article_data.get('description', '')}"
-                        sentiment = self.calculate_sentiment(full_text)
-                        
-                        article = NewsArticle(
-                            title=article_data['title'],
-                            description=article_data.get('description', ''),
-                            content=article_data.get('content', ''),
-                            url=article_data.get('url', ''),
-                            published_at=article_data.get('publishedAt', ''),
-                            source=article_data.get('source', {}).get('name', 'NewsAPI'),
-                            sentiment_score=sentiment['compound'],
-                            sentiment_label=self.get_sentiment_label(sentiment['compound'])
-                        )
-                        articles.append(article)
+                        published_ts = parse_published_at(article_data.get('publishedAt', '')) or fetched_at
+                        if (since and published_ts <= since) or (until and published_ts > until):
+                            continue
+                        page.append((article_data, published_ts))
+                
+                # Combine title and description for sentiment analysis, scored as one batch
+                sentiments = self.calculate_sentiment_batch(
+                    [f"{article_data['title']} {article_data.get('description', '')}" for article_data, _ in page]
+                )
+                
+                for (article_data, published_ts), sentiment in zip(page, sentiments):
+                    article = NewsArticle(
+                        title=article_data['title'],
+                        description=article_data.get('description', ''),
+                        content=article_data.get('content', ''),
+                        url=article_data.get('url', ''),
+                        source=article_data.get('source', {}).get('name', 'NewsAPI'),
+                        sentiment_score=sentiment['compound'],
+                        sentiment_label=self.get_sentiment_label(sentiment['compound']),
+                        provider='newsapi',
+                        published_ts=published_ts
+                    )
+                    articles.append(article)
             
             logger.info(f"Fetched {len(articles)} articles from NewsAPI for query: {query}")
             return articles
             
+        except ProviderUnavailable as e:
+            logger.warning(f"Skipped fetching NewsAPI data: {e}")
+            return FetchedArticles(complete=False)
         except Exception as e:
             logger.error(f"Error fetching NewsAPI data: {e}")
-            return []
+            return FetchedArticles(complete=False)
 
-    def fetch_alpha_vantage_news(self, symbol: str) -> List[NewsArticle]:
-        """Fetch news from Alpha Vantage News & Sentiment API"""
-        if not self.news_apis['alpha_vantage']['enabled']:
-            return []
+    def _alpha_vantage_entries(self, feed: List[Dict], fetched_at: int) -> List[Tuple[NewsArticle, Dict[str, float]]]:
+        """Parse NEWS_SENTIMENT feed items into (article, {ticker: ticker_sentiment_score}) pairs"""
+        entries = []
+        for article_data in feed:
+            if not (article_data.get('title') and article_data.get('summary')):
+                continue
+            published_ts = parse_published_at(article_data.get('time_published', '')) or fetched_at
+            overall_score = float(article_data.get('overall_sentiment_score') or 0.0)
+            
+            ticker_scores = {}
+            for ticker_sentiment in article_data.get('ticker_sentiment') or []:
+                ticker = str(ticker_sentiment.get('ticker', '')).upper()
+                if not ticker:
+                    continue
+                try:
+                    ticker_scores[ticker] = float(ticker_sentiment.get('ticker_sentiment_score', overall_score))
+                except (TypeError, ValueError):
+                    ticker_scores[ticker] = overall_score
+            
+            article = NewsArticle(
+                title=article_data['title'],
+                description=article_data.get('summary', ''),
+                content=article_data.get('summary', ''),
+                url=article_data.get('url', ''),
+                source=article_data.get('source', 'Alpha Vantage'),
+                sentiment_score=overall_score,
+                sentiment_label=self.get_sentiment_label(overall_score),
+                provider='alpha_vantage',
+                published_ts=published_ts
+            )
+            entries.append((article, ticker_scores))
+        return entries
+
+    def _index_alpha_vantage(self, params: Dict, since_ts: int, symbol: Optional[str] = None,
+                             mark_covered: bool = True) -> int:
+        """Run one NEWS_SENTIMENT call, index its articles under every ticker, and return the
+        timestamp from which the results are complete (older ones may have been cut by the limit)"""
+        fetched_at = time.time()
+        data = self._provider_get('alpha_vantage', params)
+        feed = data.get('feed', [])
+        entries = self._alpha_vantage_entries(feed, int(fetched_at))
+        if symbol:
+            # The requested ticker always gets a posting, at the overall score if it has no entry
+            for article, ticker_scores in entries:
+                ticker_scores.setdefault(symbol, article.sentiment_score)
+        self.ticker_index.add(entries)
         
-        api_key = self.news_apis['alpha_vantage']['api_key']
+        complete_from = since_ts
+        if len(feed) >= params['limit'] and entries:
+            complete_from = max(since_ts, min(article.published_ts for article, _ in entries) + 1)
+        if not mark_covered:
+            return complete_from
+        if symbol:
+            self.ticker_index.mark_ticker_covered(symbol, complete_from, fetched_at)
+        else:
+            self.ticker_index.mark_feed_covered(complete_from, fetched_at)
+        return complete_from
+
+    def _refresh_alpha_vantage_feed(self, since_ts: int):
+        """Index the market-wide latest news, at most once per ALPHA_VANTAGE_FEED_TTL across all symbols.
         
-        try:
+        NEWS_SENTIMENT treats several tickers as "mentions all of them", so a grouped
+        call cannot serve several symbols; a call without tickers lists every article
+        with its full ticker_sentiment, and the index routes it to each ticker.
+        """
+        with self._feed_lock:
+            coverage = self.ticker_index.feed_coverage
+            if coverage and time.time() - coverage[1] < ALPHA_VANTAGE_FEED_TTL:
+                return
+            # Start from the previous refresh (with a minute of overlap) so consecutive feeds join up
+            if coverage:
+                since_ts = min(since_ts, int(coverage[1]))
+            since_ts -= 60
             params = {
                 'function': 'NEWS_SENTIMENT',
-                'tickers': symbol,
-                'apikey': api_key,
-                'limit': 50
+                'apikey': self.news_apis['alpha_vantage']['api_key'],
+                'sort': 'LATEST',
+                'limit': ALPHA_VANTAGE_MAX_LIMIT,
+                'time_from': _format_since(since_ts, '%Y%m%dT%H%M')
             }
+            complete_from = self._index_alpha_vantage(params, since_ts)
+            logger.info(f"Indexed Alpha Vantage market feed, complete since {complete_from}: {self.ticker_index.stats()}")
+
+    def fetch_alpha_vantage_news(self, symbol: str, days_back: int = 7, since: Optional[int] = None,
+                                 page_budget: int = MAX_PAGES, until: Optional[int] = None) -> List[NewsArticle]:
+        """Fetch Alpha Vantage news for a symbol, only articles newer than `since` and not after `until` when given.
+        
+        Answered from the ticker index while it is complete and fresh for the symbol;
+        a symbol with indexed history is topped up by the shared market feed, and
+        only one the feed cannot cover (or a bounded gap refill) costs a single-ticker call.
+        """
+        if not self.news_apis['alpha_vantage']['enabled']:
+            return []
+        
+        symbol = symbol.upper()
+        since_ts = since + 1 if since else _window_start(days_back)
+        
+        try:
+            source = 'index'
+            complete = True
+            articles = None if until else self.ticker_index.lookup(symbol, since_ts, ALPHA_VANTAGE_FEED_TTL)
+            if articles is None and not until:
+                coverage = self.ticker_index.coverage(symbol)
+                if coverage and coverage[0] <= since_ts:
+                    source = 'feed'
+                    self._refresh_alpha_vantage_feed(int(coverage[1]))
+                    articles = self.ticker_index.lookup(symbol, since_ts, ALPHA_VANTAGE_FEED_TTL)
             
-            response = requests.get(self.news_apis['alpha_vantage']['base_url'], params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            articles = []
-            
-            if 'feed' in data:
-                for article_data in data['feed']:
-                    if article_data.get('title') and article_data.get('summary'):
-                        # Alpha Vantage provides sentiment scores directly
-                        sentiment_score = 0.0
-                        if 'overall_sentiment_score' in article_data:
-                            sentiment_score = float(article_data['overall_sentiment_score'])
-                        elif 'ticker_sentiment' in article_data and article_data['ticker_sentiment']:
-                            # Use the first ticker's sentiment
-                            ticker_sentiment = article_data['ticker_sentiment'][0]
-                            sentiment_score = float(ticker_sentiment.get('ticker_sentiment_score', 0))
-                        
-                        article = NewsArticle(
-                            title=article_data['title'],
-                            description=article_data.get('summary', ''),
-                            content=article_data.get('summary', ''),
-                            url=article_data.get('url', ''),
-                            published_at=article_data.get('time_published', ''),
-                            source=article_data.get('source', 'Alpha Vantage'),
-                            sentiment_score=sentiment_score,
-                            sentiment_label=self.get_sentiment_label(sentiment_score)
-                        )
-                        articles.append(article)
+            if articles is None:
+                source = 'ticker'
+                params = {
+                    'function': 'NEWS_SENTIMENT',
+                    'tickers': symbol,
+                    'apikey': self.news_apis['alpha_vantage']['api_key'],
+                    'sort': 'LATEST',
+                    # No paging here: the budget becomes a larger limit on the single call
+                    'limit': min(ALPHA_VANTAGE_MAX_LIMIT, ALPHA_VANTAGE_PAGE_SIZE * page_budget),
+                    'time_from': _format_since(since_ts, '%Y%m%dT%H%M')
+                }
+                if until:
+                    # Round up to the minute so the bound stays inclusive
+                    params['time_to'] = _format_since(until + 59, '%Y%m%dT%H%M')
+                complete_from = self._index_alpha_vantage(params, since_ts, symbol=symbol, mark_covered=not until)
+                complete = complete_from <= since_ts
+                articles = self.ticker_index.articles(symbol, since_ts)
+                if until:
+                    articles = [article for article in articles if article.published_ts <= until]
             
-            logger.info(f"Fetched {len(articles)} articles from Alpha Vantage for symbol: {symbol}")
-            return articles
+            ALPHA_VANTAGE_LOOKUPS.inc(1, source)
+            logger.info(f"Fetched {len(articles)} articles from Alpha Vantage for symbol: {symbol} (via {source})")
+            return FetchedArticles(articles, complete=complete)
             
+        except ProviderUnavailable as e:
+            logger.warning(f"Skipped fetching Alpha Vantage news: {e}")
+            return FetchedArticles(complete=False)
         except Exception as e:
             logger.error(f"Error fetching Alpha Vantage news: {e}")
-            return []
+            return FetchedArticles(complete=False)
 
-    def fetch_polygon_news(self, symbol: str, days_back: int = 7) -> List[NewsArticle]:
-        """Fetch news from Polygon.io"""
+    def _polygon_pages(self, params: Dict, budget: int, cutoff: int) -> Tuple[List[Dict], bool]:
+        """Polygon results following next_url cursors (inherently sequential) within the budget and window,
+        and whether they reach back to the cutoff"""
+        data = self._provider_get('polygon', params)
+        items = []
+        pages = 1
+        while True:
+            page_items = data.get('results', [])
+            items.extend(page_items)
+            next_url = data.get('next_url')
+            if not next_url or not page_items or _reached_cutoff(page_items, 'published_utc', cutoff):
+                return items, True
+            if pages >= budget:
+                return items, False
+            try:
+                data = self._provider_get('polygon', {'apikey': params['apikey']}, url=next_url)
+            except Exception as e:
+                logger.warning(f"Stopped Polygon paging for {params['ticker']}: {e}")
+                return items, False
+            pages += 1
+
+    def fetch_polygon_news(self, symbol: str, days_back: int = 7, since: Optional[int] = None,
+                           page_budget: int = MAX_PAGES, until: Optional[int] = None) -> List[NewsArticle]:
+        """Fetch news from Polygon.io, only articles newer than `since` and not after `until` (epoch) when given"""
         if not self.news_apis['polygon']['enabled']:
             return []
         
@@ -229,132 +623,342 @@ class NewsSentimentScraper:
             params = {
                 'ticker': symbol,
                 'published_utc.gte': from_date.strftime('%Y-%m-%d'),
-                'published_utc.lte': to_date.strftime('%Y-%m-%d'),
-                'limit': 50,
+                'published_utc.lte': _format_since(until, '%Y-%m-%dT%H:%M:%SZ') if until else to_date.strftime('%Y-%m-%d'),
+                'order': 'desc',
+                'sort': 'published_utc',
+                'limit': POLYGON_PAGE_SIZE,
                 'apikey': api_key
             }
+            if since:
+                del params['published_utc.gte']
+                params['published_utc.gt'] = _format_since(since, '%Y-%m-%dT%H:%M:%SZ')
             
-            response = requests.get(self.news_apis['polygon']['base_url'], params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            articles = []
+            results, complete = self._polygon_pages(params, page_budget, since or _window_start(days_back))
+            articles = FetchedArticles(complete=complete)
+            fetched_at = int(time.time())  # Stands in for missing or unparseable timestamps
             
-            if 'results' in data:
-                for article_data in data['results']:
+            if results:
+                page = []
+                for article_data in results:
                     if article_data.get('title') and article_data.get('description'):
-                        full_text = f"{article_data['title']} {article_data.get('description', '')}"
-                        sentiment = self.calculate_sentiment(full_text)
-                        
-                        article = NewsArticle(
-                            title=article_data['title'],
-                            description=article_data.get('description', ''),
-                            content=article_data.get('content', ''),
-                            url=article_data.get('article_url', ''),
-                            published_at=article_data.get('published_utc', ''),
-                            source=article_data.get('publisher', {}).get('name', 'Polygon'),
-                            sentiment_score=sentiment['compound'],
-                            sentiment_label=self.get_sentiment_label(sentiment['compound'])
-                        )
-                        articles.append(article)
+                        published_ts = parse_published_at(article_data.get('published_utc', '')) or fetched_at
+                        if (since and published_ts <= since) or (until and published_ts > until):
+                            continue
+                        page.append((article_data, published_ts))
+                
+                sentiments = self.calculate_sentiment_batch(
+                    [f"{article_data['title']} {article_data.get('description', '')}" for article_data, _ in page]
+                )
+                
+                for (article_data, published_ts), sentiment in zip(page, sentiments):
+                    article = NewsArticle(
+                        title=article_data['title'],
+                        description=article_data.get('description', ''),
+                        content=article_data.get('content', ''),
+                        url=article_data.get('article_url', ''),
+                        source=article_data.get('publisher', {}).get('name', 'Polygon'),
+                        sentiment_score=sentiment['compound'],
+                        sentiment_label=self.get_sentiment_label(sentiment['compound']),
+                        provider='polygon',
+                        published_ts=published_ts
+                    )
+                    articles.append(article)
             
             logger.info(f"Fetched {len(articles)} articles from Polygon for symbol: {symbol}")
             return articles
             
+        except ProviderUnavailable as e:
+            logger.warning(f"Skipped fetching Polygon news: {e}")
+            return FetchedArticles(complete=False)
         except Exception as e:
             logger.error(f"Error fetching Polygon news: {e}")
+            return FetchedArticles(complete=False)
+
+    def _provider_fetchers(self, symbol: str, days_back: int) -> Dict:
+        """Map each provider name to a zero-argument fetch callable"""
+        budget = self.page_budget(symbol)
+        fetchers = {
+            'newsapi': lambda since=None, until=None: self.fetch_newsapi_news(
+                f"{symbol} stock", days_back, since=since, page_budget=budget, until=until),
+            'alpha_vantage': lambda since=None, until=None: self.fetch_alpha_vantage_news(
+                symbol, days_back, since=since, page_budget=budget, until=until),
+            'polygon': lambda since=None, until=None: self.fetch_polygon_news(
+                symbol, days_back, since=since, page_budget=budget, until=until)
+        }
+        if not self.article_store:
+            return fetchers
+        
+        watermarks = self.article_store.get_watermarks(symbol)
+        window_start = _window_start(days_back)
+        return {
+            name: (lambda name=name, fetch=fetch: self._fetch_incremental(
+                symbol, name, fetch, watermarks.get(name), window_start))
+            for name, fetch in fetchers.items()
+        }
+
+    def _fetch_incremental(self, symbol: str, provider: str, fetch, watermark: Optional[Tuple],
+                           window_start: int) -> List[NewsArticle]:
+        """Fetch only articles past the stored watermark and persist them.
+        
+        A fetch cut short by the page budget or a result cap leaves a gap between
+        its oldest article and where it should have reached back to. The gap is
+        recorded with the watermark and refilled, newest first, by bounded fetches
+        on later refreshes, one per refresh.
+        """
+        since = None
+        covered_from = window_start
+        gap = None
+        if watermark:
+            newest_ts, covered_from_ts, gap = watermark
+            # Only go incremental when the stored history already covers the requested window
+            if covered_from_ts <= window_start:
+                since = newest_ts
+                covered_from = None
+            else:
+                gap = None  # The full refetch below spans it
+        
+        fetched = fetch(since=since)
+        if self._fetch_failed(fetched):
+            # Leave the watermark and any recorded gap for the next refresh to retry
+            logger.info(f"{provider} fetch for {symbol} failed, stored history left unchanged")
             return []
+        missing = self._truncation_gap(fetched, since or window_start)
+        articles = list(fetched)
+        if gap:
+            refill = fetch(since=gap[0], until=gap[1])
+            articles.extend(refill)
+            if self._fetch_failed(refill):
+                logger.info(f"{provider} gap refill for {symbol} failed, gap {gap[0]}..{gap[1]} kept")
+            else:
+                # Refills run newest first, so a truncated one leaves the older part of the gap
+                gap = self._truncation_gap(refill, gap[0])
+        if missing:
+            # Stored history still counts as reaching back to the window start, minus the gap
+            logger.info(f"{provider} fetch for {symbol} truncated, gap {missing[0]}..{missing[1]} left to refill")
+            gap = (min(gap[0], missing[0]), max(gap[1], missing[1])) if gap else missing
+        
+        new_articles = self.article_store.add_articles(symbol, provider, articles, covered_from_ts=covered_from,
+                                                       gap=gap)
+        logger.info(f"{provider} delta for {symbol}: {len(new_articles)} new articles (since={since})")
+        return new_articles
 
-    def scrape_news_for_symbol(self, symbol: str, days_back: int = 7) -> List[NewsArticle]:
-        """Scrape news from all available APIs for a given symbol"""
+    @staticmethod
+    def _fetch_failed(articles: List[NewsArticle]) -> bool:
+        """True for a fetch that errored or was denied, rather than one that found nothing"""
+        return not articles and not getattr(articles, 'complete', True)
+
+    @staticmethod
+    def _truncation_gap(articles: List[NewsArticle], since: int) -> Optional[Tuple[int, int]]:
+        """(since, oldest returned) when a fetch stopped before reaching back to since, else None"""
+        if getattr(articles, 'complete', True) or not articles:
+            return None
+        return since, min(article.published_ts for article in articles)
+
+    @staticmethod
+    def _traced_fetch(name: str, fetch) -> List[NewsArticle]:
+        with span(f"provider.{name}"):
+            return fetch()
+
+    def fetch_all_providers(self, symbol: str, days_back: int = 7,
+                            deadline: Optional[float] = None) -> Tuple[List[NewsArticle], Dict[str, List[str]]]:
+        """Fetch from every enabled provider under one overall deadline.
+
+        Providers run concurrently, or one at a time with NEWS_CONCURRENT_FETCH=false;
+        either way the caller waits at most `deadline` seconds and a provider still
+        running then is skipped (its call finishes in the background).
+
+        Returns the articles from providers that finished in time, plus a status
+        dict listing which providers were fetched, skipped (deadline), disabled,
+        rate limited or behind an open circuit breaker.
+        """
+        deadline = self.fetch_deadline if deadline is None else deadline
+        fetchers = self._provider_fetchers(symbol, days_back)
+        status = {'fetched': [], 'skipped': [], 'disabled': [], 'rate_limited': [], 'circuit_open': []}
+        
+        enabled = {}
+        for name, fetch in fetchers.items():
+            if not self.news_apis[name]['enabled']:
+                status['disabled'].append(name)
+                continue
+            # Route around providers that would only burn a round-trip to fail
+            reason = self.quota.check(name)
+            if reason:
+                status[reason].append(name)
+                PROVIDER_SKIPPED.inc(1, name, reason)
+                continue
+            enabled[name] = fetch
+        
         all_articles = []
+        started = time.monotonic()
         
-        # Fetch from NewsAPI
-        newsapi_articles = self.fetch_newsapi_news(f"{symbol} stock", days_back)
-        all_articles.extend(newsapi_articles)
+        if self.concurrent_fetch:
+            futures = {
+                self._fetch_executor.submit(propagate(self._traced_fetch), name, fetch): name
+                for name, fetch in enabled.items()
+            }
+            done, not_done = wait(futures, timeout=deadline)
+            # Keep provider order stable so results don't depend on completion order
+            for future, name in futures.items():
+                if future in done:
+                    articles = future.result()
+                    all_articles.extend(articles)
+                    status['fetched'].append(name)
+                    ARTICLES_INGESTED.inc(len(articles), name)
+                else:
+                    future.cancel()
+                    status['skipped'].append(name)
+                    PROVIDER_SKIPPED.inc(1, name, 'deadline')
+        else:
+            for name, fetch in enabled.items():
+                remaining = deadline - (time.monotonic() - started)
+                if remaining > 0:
+                    # One provider at a time, but never waiting past the deadline on a slow call
+                    future = self._fetch_executor.submit(propagate(self._traced_fetch), name, fetch)
+                    try:
+                        articles = future.result(timeout=remaining)
+                    except FuturesTimeoutError:
+                        future.cancel()
+                    else:
+                        all_articles.extend(articles)
+                        status['fetched'].append(name)
+                        ARTICLES_INGESTED.inc(len(articles), name)
+                        continue
+                status['skipped'].append(name)
+                PROVIDER_SKIPPED.inc(1, name, 'deadline')
         
-        # Fetch from Alpha Vantage
-        alpha_articles = self.fetch_alpha_vantage_news(symbol)
-        all_articles.extend(alpha_articles)
+        if status['skipped']:
+            logger.warning(f"Providers skipped for {symbol} after {deadline}s deadline: {', '.join(status['skipped'])}")
         
-        # Fetch from Polygon (if enabled)
-        polygon_articles = self.fetch_polygon_news(symbol, days_back)
-        all_articles.extend(polygon_articles)
+        return all_articles, status
+
+    def scrape_news_for_symbol(self, symbol: str, days_back: int = 7) -> List[NewsArticle]:
+        """Scrape news from all available APIs for a given symbol, newest first"""
+        window, _ = self.get_article_window(symbol, days_back)
+        return window.articles_since(_window_start(days_back))
+
+    def get_article_page(self, symbol: str, days_back: int = 7, limit: int = 20,
+                         before: Optional[Tuple[int, str]] = None) -> Tuple[List[NewsArticle], int, float]:
+        """One page of articles older than the cursor, newest first, with the window total and build time"""
+        window, _ = self.get_article_window(symbol, days_back)
+        since_ts = _window_start(days_back)
+        page = window.articles_since(since_ts, limit=limit, before=before)
+        return page, window.count_since(since_ts), window.built_at
+
+    def get_article_window(self, symbol: str, days_back: int,
+                           max_age: Optional[float] = None) -> Tuple[ArticleWindow, Dict[str, List[str]]]:
+        """Return the symbol's superset article window, scraping only if it is stale or too short.
+        
+        The window covers the largest days_back requested recently (capped at
+        NEWS_WINDOW_MAX_DAYS for carry-over), so days=7/14/30 share one scrape.
+        max_age tightens the reuse limit below NEWS_WINDOW_TTL for callers that
+        are themselves refreshing a cache (0 forces a scrape).
+        """
+        max_age = self.window_ttl if max_age is None else min(max_age, self.window_ttl)
+        with self._windows_lock:
+            symbol_lock = self._window_locks.setdefault(symbol, threading.Lock())
+        
+        # Concurrent requests for one symbol wait for a single scrape, whatever their window
+        with symbol_lock:
+            with self._windows_lock:
+                entry = self._windows.get(symbol)
+            if entry:
+                built_at, days_covered, window, status = entry
+                if days_covered >= days_back and time.time() - built_at < max_age:
+                    return window, status
+            
+            superset_days = max(days_back, min(entry[1], WINDOW_MAX_DAYS) if entry else 0)
+            articles, status = self._scrape_with_status(symbol, superset_days)
+            with span('window'):
+                window = ArticleWindow(articles)
+                if entry and window.articles == entry[2].articles:
+                    # Same articles as before: keep the build time so summaries (and their ETags) are unchanged
+                    window.built_at = entry[2].built_at
+            
+            with self._windows_lock:
+                self._windows[symbol] = (time.time(), superset_days, window, status)
+                self._windows.move_to_end(symbol)
+                while len(self._windows) > WINDOW_MAX_SYMBOLS:
+                    evicted, _ = self._windows.popitem(last=False)
+                    self._window_locks.pop(evicted, None)
+            return window, status
+
+    def _scrape_with_status(self, symbol: str, days_back: int) -> Tuple[List[NewsArticle], Dict[str, List[str]]]:
+        """Scrape, de-duplicate and sort articles, keeping the provider status"""
+        all_articles, status = self.fetch_all_providers(symbol, days_back)
+        if self.article_store:
+            # Fetchers only returned the delta, the full window comes from stored history
+            all_articles = self.article_store.load_articles(symbol, _window_start(days_back))
         
         # Remove duplicates based on title similarity
         unique_articles = self._remove_duplicates(all_articles)
         
         # Sort by published date (newest first)
-        unique_articles.sort(key=lambda x: x.published_at, reverse=True)
+        unique_articles.sort(key=lambda x: x.published_ts, reverse=True)
         
         logger.info(f"Total unique articles for {symbol}: {len(unique_articles)}")
-        return unique_articles
+        return unique_articles, status
 
     def _remove_duplicates(self, articles: List[NewsArticle]) -> List[NewsArticle]:
-        """Remove duplicate articles based on title similarity"""
-        unique_articles = []
-        seen_titles = set()
-        
-        for article in articles:
-            # Simple deduplication based on title
-            title_key = article.title.lower().strip()
-            if title_key not in seen_titles and len(title_key) > 10:
-                seen_titles.add(title_key)
-                unique_articles.append(article)
-        
-        return unique_articles
+        """Collapse near-duplicate articles (title + description), keeping the best of each cluster"""
+        candidates = [article for article in articles if len(article.title.strip()) > 10]
+        with span('dedup'):
+            return self.dedup.dedupe(
+                candidates,
+                text_fn=lambda article: f"{article.title} {article.description}",
+                rank_fn=self._representative_rank
+            )
+
+    @staticmethod
+    def _representative_rank(article: NewsArticle):
+        """Prefer articles with full content, then richer descriptions, then the newest"""
+        return (bool(article.content), len(article.description), article.published_ts)
 
     def calculate_aggregate_sentiment(self, articles: List[NewsArticle]) -> Dict[str, float]:
         """Calculate aggregate sentiment from a list of articles"""
         if not articles:
-            # Generate simulated sentiment data when no real articles are available
-            import random
-            base_sentiment = (random.random() - 0.5) * 2  # -1 to 1 range
-            articles_count = random.randint(5, 20)
-            
-            positive_count = int(articles_count * (0.3 + random.random() * 0.4))
-            negative_count = int(articles_count * (0.1 + random.random() * 0.3))
-            neutral_count = articles_count - positive_count - negative_count
-            
-            return {
-                'average_sentiment': base_sentiment,
-                'positive_count': positive_count,
-                'negative_count': negative_count,
-                'neutral_count': neutral_count,
-                'total_articles': articles_count,
-                'sentiment_confidence': 0.6 + random.random() * 0.3
-            }
-        
-        total_sentiment = sum(article.sentiment_score for article in articles)
-        average_sentiment = total_sentiment / len(articles)
-        
-        positive_count = sum(1 for article in articles if article.sentiment_label == 'positive')
-        negative_count = sum(1 for article in articles if article.sentiment_label == 'negative')
-        neutral_count = sum(1 for article in articles if article.sentiment_label == 'neutral')
-        
-        # Calculate confidence based on sentiment score distribution
-        sentiment_variance = sum((article.sentiment_score - average_sentiment) ** 2 for article in articles) / len(articles)
-        sentiment_confidence = max(0, 1 - sentiment_variance)
+            return self._empty_aggregate()
+        with span('aggregate'):
+            return ArticleWindow(articles).aggregate()
+
+    def _empty_aggregate(self, provider_status: Optional[Dict[str, List[str]]] = None) -> Dict:
+        """Aggregate for a window without articles, flagged unavailable when no provider could be asked.
         
-        return {
-            'average_sentiment': average_sentiment,
-            'positive_count': positive_count,
-            'negative_count': negative_count,
-            'neutral_count': neutral_count,
-            'total_articles': len(articles),
-            'sentiment_confidence': sentiment_confidence
+        Always the same for the same status, so cached summaries and pushed
+        updates don't change when nothing was learned.
+        """
+        aggregate = {
+            'average_sentiment': 0.0,
+            'positive_count': 0,
+            'negative_count': 0,
+            'neutral_count': 0,
+            'total_articles': 0,
+            'sentiment_confidence': 0.0,
+            'available': True
         }
+        if provider_status is not None and not provider_status.get('fetched'):
+            aggregate['available'] = False
+            # Which of rate_limited, circuit_open, skipped (deadline) or disabled kept each provider out
+            aggregate['unavailable_providers'] = {
+                reason: names for reason, names in provider_status.items() if reason != 'fetched' and names
+            }
+        return aggregate
 
-    def get_news_sentiment_summary(self, symbol: str, days_back: int = 7) -> Dict:
-        """Get a comprehensive news sentiment summary for a symbol"""
-        articles = self.scrape_news_for_symbol(symbol, days_back)
-        aggregate = self.calculate_aggregate_sentiment(articles)
+    def get_news_sentiment_summary(self, symbol: str, days_back: int = 7, max_age: Optional[float] = None) -> Dict:
+        """Get a comprehensive news sentiment summary for a symbol, from a window at most max_age seconds old"""
+        window, provider_status = self.get_article_window(symbol, days_back, max_age)
+        since_ts = _window_start(days_back)
+        
+        # O(log n) over the superset window instead of a pass over the articles
+        with span('aggregate'):
+            aggregate = window.aggregate(since_ts) or self._empty_aggregate(provider_status)
         
         return {
             'symbol': symbol,
-            'analysis_date': datetime.now().isoformat(),
+            # When the window's articles last changed, so identical data serializes identically
+            'analysis_date': datetime.fromtimestamp(window.built_at).isoformat(),
             'days_analyzed': days_back,
-            'articles_analyzed': len(articles),
+            'articles_analyzed': window.count_since(since_ts),
+            'providers': provider_status,
             'aggregate_sentiment': aggregate,
             'recent_articles': [
                 {
@@ -364,7 +968,7 @@ class NewsSentimentScraper:
                     'source': article.source,
                     'published_at': article.published_at
                 }
-                for article in articles[:10]  # Top 10 most recent
+                for article in window.articles_since(since_ts, limit=10)  # Top 10 most recent
             ]
         }
 
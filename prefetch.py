@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Prefetch Scheduler
+Keeps cache entries for a watchlist warm ahead of expiry from background threads
+"""
+
+import os
+import time
+import threading
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Comma separated SYMBOL[:DAYS] entries, e.g. "AAPL:7,MSFT:7,TSLA:30"
+PREFETCH_WATCHLIST = os.getenv('PREFETCH_WATCHLIST', '')
+# Refresh once an entry has used this fraction of its TTL
+PREFETCH_REFRESH_RATIO = float(os.getenv('PREFETCH_REFRESH_RATIO', '0.8'))
+# Refreshes run concurrently, so one slow scrape does not hold up the rest of the watchlist
+PREFETCH_WORKERS = int(os.getenv('PREFETCH_WORKERS', '4'))
+
+
+def parse_watchlist(value: str, default_days: int = 7) -> List[Tuple[str, int]]:
+    """Parse "AAPL:7,MSFT" into [('AAPL', 7), ('MSFT', 7)]"""
+    watchlist = []
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        symbol, _, days = item.partition(':')
+        watchlist.append((symbol.upper(), int(days) if days else default_days))
+    return watchlist
+
+
+class PrefetchScheduler:
+    """Refreshes watchlist entries evenly over each TTL period, most requested first"""
+
+    def __init__(self, cache, key_fn: Callable[[str, int], str], fetch_fn: Callable[[str, int], Any],
+                 watchlist: List[Tuple[str, int]] = None, refresh_ratio: float = PREFETCH_REFRESH_RATIO,
+                 on_refresh: Callable[[str, int, Any], None] = None, workers: int = PREFETCH_WORKERS):
+        self.cache = cache
+        self.key_fn = key_fn
+        self.fetch_fn = fetch_fn
+        self.on_refresh = on_refresh
+        self.refresh_interval = cache.ttl * refresh_ratio
+        self.popularity = Counter()  # Watchlist entries only, so it is bounded by the watchlist
+        self.refreshes = 0
+        self._next_due: Dict[Tuple[str, int], float] = {}
+        self._in_flight = set()
+        self.workers = max(1, workers)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+        for symbol, days in watchlist or []:
+            self.add(symbol, days)
+
+    def add(self, symbol: str, days: int):
+        """Add an entry to the watchlist, due immediately"""
+        with self._lock:
+            if (symbol, days) not in self._next_due:
+                self._next_due[(symbol, days)] = time.time()
+                self._wake.set()
+
+    def remove(self, symbol: str, days: int):
+        """Stop keeping an entry warm"""
+        with self._lock:
+            self._next_due.pop((symbol, days), None)
+            self.popularity.pop((symbol, days), None)
+
+    def record_request(self, symbol: str, days: int):
+        """Count a user request so popular entries are refreshed first; requests for
+        entries off the watchlist are not tracked, any client can invent new keys"""
+        with self._lock:
+            if (symbol, days) in self._next_due:
+                self.popularity[(symbol, days)] += 1
+
+    def _tick_seconds(self) -> float:
+        """Spread one TTL period worth of refreshes evenly across the watchlist"""
+        return self.refresh_interval / max(1, len(self._next_due))
+
+    def _pick_due(self):
+        """Most popular entry that is due for refresh and not already refreshing, or None"""
+        now = time.time()
+        with self._lock:
+            if len(self._in_flight) >= self.workers:
+                return None
+            due = [entry for entry, due_at in self._next_due.items()
+                   if due_at <= now and entry not in self._in_flight]
+            if not due:
+                return None
+            entry = max(due, key=lambda entry: (self.popularity[entry], -self._next_due[entry]))
+            self._in_flight.add(entry)
+            return entry
+
+    def _refresh(self, symbol: str, days: int):
+        key = self.key_fn(symbol, days)
+        age = self.cache.age(key)
+        # Another worker sharing the cache may already have refreshed this entry
+        if age is None or age >= self.refresh_interval:
+            self.cache.refresh(key, lambda: self.fetch_fn(symbol, days))
+            with self._lock:
+                self.refreshes += 1
+            logger.info(f"Prefetched {key}")
+            age = 0.0
+
+        if self.on_refresh:
+            self.on_refresh(symbol, days, self.cache.peek(key))
+
+        with self._lock:
+            if (symbol, days) in self._next_due:
+                self._next_due[(symbol, days)] = time.time() + max(0.0, self.refresh_interval - age)
+
+    def _refresh_entry(self, entry: Tuple[str, int]):
+        try:
+            self._refresh(*entry)
+        except Exception as e:
+            logger.error(f"Prefetch failed for {entry}: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(entry)
+            # A freed slot may let an overdue entry start before the next tick
+            self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            # Start every due entry there is a free worker for, the scrapes run side by side
+            entry = self._pick_due()
+            while entry is not None:
+                self._executor.submit(self._refresh_entry, entry)
+                entry = self._pick_due()
+            with self._lock:
+                tick = self._tick_seconds()
+            self._wake.wait(tick)
+            self._wake.clear()
+
+    def start(self):
+        """Start the background refresher thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='sentiment-prefetch-refresh')
+        self._thread = threading.Thread(target=self._run, name='sentiment-prefetch', daemon=True)
+        self._thread.start()
+        logger.info(f"Prefetch scheduler started for {len(self._next_due)} watchlist entries")
+
+    def stop(self):
+        """Stop the background refresher thread; refreshes already running finish on their own"""
+        self._stop.set()
+        self._wake.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'watchlist': [f"{symbol}:{days}" for symbol, days in self._next_due],
+                'refreshes': self.refreshes,
+                'in_flight': len(self._in_flight),
+                'refresh_interval': self.refresh_interval,
+                'most_requested': [f"{symbol}:{days}" for (symbol, days), _ in self.popularity.most_common(10)]
+            }
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Provider Quota
+Token-bucket rate limits and circuit breakers for the news providers
+"""
+
+import os
+import time
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Documented free-tier quotas as (calls, per_seconds); override with e.g. ALPHA_VANTAGE_QUOTA=75/60
+DEFAULT_QUOTAS = {
+    'newsapi': (100, 86400),      # Developer plan: 100 requests per day
+    'alpha_vantage': (5, 60),     # Free key: 5 requests per minute
+    'polygon': (5, 60)            # Basic plan: 5 requests per minute
+}
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('PROVIDER_BREAKER_FAILURES', '3'))
+BREAKER_COOLOFF_SECONDS = float(os.getenv('PROVIDER_BREAKER_COOLOFF', '60'))
+# SQLite file holding bucket and breaker state for every worker process; empty keeps it in-process
+QUOTA_STATE_PATH = os.getenv('PROVIDER_QUOTA_PATH', '')
+
+
+class ProviderUnavailable(Exception):
+    """Raised instead of calling a provider that is rate limited or tripped"""
+
+    def __init__(self, provider: str, reason: str):
+        super().__init__(f"{provider} unavailable: {reason}")
+        self.provider = provider
+        self.reason = reason
+
+
+def _quota_from_env(provider: str) -> Tuple[int, float]:
+    value = os.getenv(f"{provider.upper()}_QUOTA")
+    if not value:
+        return DEFAULT_QUOTAS[provider]
+    calls, _, seconds = value.partition('/')
+    return int(calls), float(seconds or 60)
+
+
+class TokenBucket:
+    """Classic token bucket: `capacity` calls, refilled evenly over `period` seconds"""
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        # Wall clock, so a timestamp stored by one worker process means the same in another
+        self.updated = time.time()
+
+    def _refill(self):
+        now = time.time()
+        self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self) -> bool:
+        self._refill()
+        return self.tokens >= 1
+
+    def take(self) -> bool:
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def drain(self):
+        """Provider told us we are over quota, stop spending until it refills"""
+        self._refill()
+        self.tokens = 0.0
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, lets one trial call through after the cool-off"""
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 cooloff: float = BREAKER_COOLOFF_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.cooloff = cooloff
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.time() - self.opened_at >= self.cooloff:
+            return 'half_open'
+        return 'open'
+
+    def allows(self) -> bool:
+        state = self.state
+        return state == 'closed' or (state == 'half_open' and not self.trial_in_flight)
+
+    def on_call(self):
+        if self.state == 'half_open':
+            self.trial_in_flight = True
+
+    def on_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def on_failure(self):
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.time()
+
+
+class QuotaStateStore:
+    """Bucket and breaker state in a SQLite WAL file, so pre-forked workers spend one shared quota"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._conn().execute('PRAGMA journal_mode=WAL')
+        self._conn().execute("""
+            CREATE TABLE IF NOT EXISTS provider_quota (
+                provider TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL,
+                failures INTEGER NOT NULL,
+                opened_at REAL,
+                trial_in_flight INTEGER NOT NULL
+            )
+        """)
+        logger.info(f"Shared provider quota state opened at {path}")
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread and process, SQLite handles the cross-process locking"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def synced(self, provider: str, bucket: TokenBucket, breaker: CircuitBreaker, write: bool = True):
+        """Load the provider's shared state into bucket and breaker, and store it back on exit"""
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE' if write else 'BEGIN')
+        try:
+            row = conn.execute(
+                'SELECT tokens, updated, failures, opened_at, trial_in_flight FROM provider_quota WHERE provider = ?',
+                (provider,)
+            ).fetchone()
+            if row:
+                bucket.tokens, bucket.updated, breaker.failures, breaker.opened_at, trial = row
+                breaker.trial_in_flight = bool(trial)
+            yield
+            if write:
+                conn.execute('INSERT OR REPLACE INTO provider_quota VALUES (?, ?, ?, ?, ?, ?)', (
+                    provider, bucket.tokens, bucket.updated, breaker.failures,
+                    breaker.opened_at, int(breaker.trial_in_flight)
+                ))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+
+class ProviderQuota:
+    """Per-provider rate limiting and circuit breaking.
+
+    With a state_path the buckets and breakers live in SQLite and are shared by
+    every process opening the same file; otherwise they are private to this process.
+    """
+
+    def __init__(self, providers=None, state_path: str = QUOTA_STATE_PATH):
+        self._lock = threading.Lock()
+        self.buckets = {}
+        self.breakers = {}
+        self.denied = {}
+        for provider in providers or DEFAULT_QUOTAS:
+            calls, period = _quota_from_env(provider)
+            self.buckets[provider] = TokenBucket(calls, period)
+            self.breakers[provider] = CircuitBreaker()
+            self.denied[provider] = 0
+        self.store = QuotaStateStore(state_path) if state_path else None
+
+    @contextmanager
+    def _state(self, provider: str, write: bool = True):
+        """Hold the lock with the provider's bucket and breaker current"""
+        with self._lock:
+            if self.store is None:
+                yield
+                return
+            with self.store.synced(provider, self.buckets[provider], self.breakers[provider], write):
+                yield
+
+    def check(self, provider: str) -> Optional[str]:
+        """Reason the provider cannot be called right now, without spending a token"""
+        with self._state(provider, write=False):
+            if not self.breakers[provider].allows():
+                return 'circuit_open'
+            if not self.buckets[provider].available():
+                return 'rate_limited'
+            return None
+
+    def acquire(self, provider: str):
+        """Spend a token for one call, raising ProviderUnavailable when denied"""
+        with self._state(provider):
+            breaker = self.breakers[provider]
+            reason = None
+            if not breaker.allows():
+                reason = 'circuit_open'
+            elif not self.buckets[provider].take():
+                reason = 'rate_limited'
+            if reason:
+                self.denied[provider] += 1
+                raise ProviderUnavailable(provider, reason)
+            breaker.on_call()
+
+    def record_success(self, provider: str):
+        with self._state(provider):
+            self.breakers[provider].on_success()
+
+    def record_failure(self, provider: str, rate_limited: bool = False):
+        """Count a failed call; a provider-side rate limit also empties the bucket"""
+        with self._state(provider):
+            breaker = self.breakers[provider]
+            was_open = breaker.opened_at is not None
+            breaker.on_failure()
+            if rate_limited:
+                self.buckets[provider].drain()
+            if breaker.opened_at is not None and not was_open:
+                logger.warning(f"Circuit opened for {provider} for {breaker.cooloff}s after {breaker.failures} failures")
+
+    def stats(self) -> Dict[str, Dict]:
+        stats = {}
+        for provider in self.buckets:
+            with self._state(provider, write=False):
+                stats[provider] = {
+                    'tokens': round(self.buckets[provider].tokens, 2),
+                    'capacity': self.buckets[provider].capacity,
+                    'circuit': self.breakers[provider].state,
+                    'consecutive_failures': self.breakers[provider].failures,
+                    'denied_calls': self.denied[provider]
+                }
+        return stats
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Response Cache
+Bounded LRU + TTL cache with single-flight computation and stale-while-revalidate.
+Storage is pluggable: a per-process memory backend, or a SQLite (WAL) file
+shared by every worker on the host with cross-process refresh leases.
+"""
+
+import os
+import time
+import pickle
+import sqlite3
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_MAX_ENTRIES = int(os.getenv('SENTIMENT_CACHE_MAX_ENTRIES', '1000'))
+# How long past expiry a value may still be served while one refresh runs
+CACHE_STALE_DURATION = float(os.getenv('SENTIMENT_CACHE_STALE_SECONDS', '300'))
+CACHE_BACKEND = os.getenv('SENTIMENT_CACHE_BACKEND', 'memory')  # memory | sqlite
+CACHE_PATH = os.getenv('SENTIMENT_CACHE_PATH', 'sentiment_cache.db')
+# Longest time one worker may hold the refresh lease for a key
+REFRESH_LEASE_SECONDS = float(os.getenv('SENTIMENT_CACHE_LEASE_SECONDS', '30'))
+# Minimum gap between LRU access-time writes for one shared-cache key (a fraction of the 30s TTL),
+# so hot reads from every worker don't queue on SQLite's single writer lock
+ACCESS_TOUCH_SECONDS = float(os.getenv('SENTIMENT_CACHE_TOUCH_SECONDS', '10'))
+
+
+class MemoryBackend:
+    """Per-process LRU storage"""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: Any, stored_at: float):
+        with self._lock:
+            self._entries[key] = (value, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def acquire_lease(self, key: str, lease_seconds: float) -> bool:
+        # Only one process uses this storage, the in-process single-flight is enough
+        return True
+
+    def release_lease(self, key: str):
+        pass
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """LRU storage in a SQLite WAL file shared by all worker processes on a host"""
+
+    def __init__(self, path: str = CACHE_PATH, max_entries: int = CACHE_MAX_ENTRIES,
+                 touch_interval: float = ACCESS_TOUCH_SECONDS):
+        self.path = path
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self.owner = f"{os.getpid()}-{id(self)}"
+        self._local = threading.local()
+        self.evictions = 0
+
+        conn = self._conn()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at);
+            CREATE TABLE IF NOT EXISTS leases (
+                key TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+        """)
+        logger.info(f"Shared sentiment cache opened at {path}")
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread, SQLite handles the cross-process locking"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            # Connections must not be shared across fork
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            self.owner = f"{os.getpid()}-{id(self)}"
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        conn = self._conn()
+        row = conn.execute('SELECT value, stored_at, accessed_at FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        # Eviction order only needs coarse recency; most hits stay read-only
+        if now - row[2] >= self.touch_interval:
+            conn.execute('UPDATE cache SET accessed_at = ? WHERE key = ? AND accessed_at < ?',
+                         (now, key, now - self.touch_interval))
+        return pickle.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, stored_at: float):
+        conn = self._conn()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)', (key, blob, stored_at, time.time()))
+            overflow = conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    'DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at LIMIT ?)',
+                    (overflow,)
+                )
+                self.evictions += overflow
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def acquire_lease(self, key: str, lease_seconds: float) -> bool:
+        """Take the cross-process refresh lease for a key, False if another worker holds it"""
+        conn = self._conn()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM leases WHERE key = ? AND expires_at < ?', (key, now))
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO leases VALUES (?, ?, ?)', (key, self.owner, now + lease_seconds)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return cursor.rowcount == 1
+
+    def release_lease(self, key: str):
+        self._conn().execute('DELETE FROM leases WHERE key = ? AND owner = ?', (key, self.owner))
+
+    def __len__(self) -> int:
+        return self._conn().execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+
+def make_cache_backend(kind: str = CACHE_BACKEND, max_entries: int = CACHE_MAX_ENTRIES):
+    """Build the configured cache backend"""
+    if kind == 'sqlite':
+        return SQLiteBackend(CACHE_PATH, max_entries=max_entries)
+    if kind != 'memory':
+        logger.warning(f"Unknown cache backend '{kind}', using memory")
+    return MemoryBackend(max_entries=max_entries)
+
+
+class _Flight:
+    """One in-progress computation that concurrent callers wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResponseCache:
+    """Size-bounded TTL cache where N concurrent misses for a key run one computation"""
+
+    def __init__(self, ttl: float, max_entries: int = CACHE_MAX_ENTRIES,
+                 stale_ttl: float = CACHE_STALE_DURATION, backend=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self.backend = backend if backend is not None else MemoryBackend(max_entries)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.lease_waits = 0
+
+    def _lookup(self, key: str):
+        """Return (value, age) for a key without touching the counters"""
+        entry = self.backend.get(key)
+        if entry is None:
+            return None, None
+        value, stored_at = entry
+        return value, time.time() - stored_at
+
+    def get(self, key: str, count_miss: bool = True) -> Optional[Any]:
+        """Return the value if it is still fresh.
+
+        Pass count_miss=False when a miss will be followed by get_or_compute,
+        which counts it.
+        """
+        value, age = self._lookup(key)
+        with self._lock:
+            if value is not None and age < self.ttl:
+                self.hits += 1
+                return value
+            if count_miss:
+                self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any):
+        """Store a value, evicting least recently used entries past the bound"""
+        self.backend.set(key, value, time.time())
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Return the stored value whatever its age, without touching the counters"""
+        return self._lookup(key)[0]
+
+    def age(self, key: str) -> Optional[float]:
+        """Seconds since a key was stored, None when it is not cached"""
+        return self._lookup(key)[1]
+
+    def refresh(self, key: str, compute: Callable[[], Any]) -> bool:
+        """Recompute a key now regardless of freshness, unless a refresh is already running"""
+        with self._lock:
+            if key in self._inflight:
+                return False
+            self._inflight[key] = _Flight()
+        self._run_flight(key, compute)
+        return True
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return a cached value, or compute it once no matter how many callers miss"""
+        value, age = self._lookup(key)
+        with self._lock:
+            if value is not None and age < self.ttl:
+                self.hits += 1
+                return value
+
+            if value is not None and age < self.ttl + self.stale_ttl:
+                # Serve the expired value while a single background refresh runs
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self._inflight[key] = _Flight()
+                    threading.Thread(target=self._run_flight, args=(key, compute),
+                                     name=f'cache-refresh-{key}', daemon=True).start()
+                return value
+
+            self.misses += 1
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if leader:
+            return self._run_flight(key, compute, raise_errors=True)
+
+        flight.event.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _run_flight(self, key: str, compute: Callable[[], Any], raise_errors: bool = False) -> Any:
+        """Compute a key as the single leader and wake everyone waiting on it"""
+        with self._lock:
+            flight = self._inflight[key]
+        try:
+            flight.value = self._compute_with_lease(key, compute)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            if raise_errors:
+                raise
+            logger.error(f"Background refresh failed for {key}: {e}")
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def _compute_with_lease(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Compute under the backend lease, or wait for the worker that holds it"""
+        started = time.time()
+        while not self.backend.acquire_lease(key, REFRESH_LEASE_SECONDS):
+            # Another worker is refreshing this key: use its result once it lands
+            with self._lock:
+                self.lease_waits += 1
+            time.sleep(0.05)
+            entry = self.backend.get(key)
+            if entry is not None and entry[1] >= started:
+                return entry[0]
+            if time.time() - started > REFRESH_LEASE_SECONDS:
+                logger.warning(f"Refresh lease for {key} not released in time, computing locally")
+                break
+
+        try:
+            value = compute()
+            self.set(key, value)
+            return value
+        finally:
+            self.backend.release_lease(key)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters"""
+        with self._lock:
+            return {
+                'backend': type(self.backend).__name__,
+                'entries': len(self.backend),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'lease_waits': self.lease_waits,
+                'evictions': self.backend.evictions,
+                'inflight': len(self._inflight)
+            }
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Score Cache
+Content-hash memoization of sentiment scores with an optional on-disk tier
+"""
+
+import os
+import hashlib
+import sqlite3
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SCORE_CACHE_SIZE = int(os.getenv('SCORE_CACHE_SIZE', '20000'))
+SCORE_CACHE_PATH = os.getenv('SCORE_CACHE_PATH', '')  # Empty disables the disk tier
+
+SCORE_FIELDS = ('compound', 'pos', 'neu', 'neg')
+
+
+def make_score_key(text: str, analyzer_version: str) -> str:
+    """Hash normalized text together with the analyzer version.
+
+    Only whitespace is normalized: VADER treats capitalization and
+    punctuation as intensity cues, so they must stay part of the key.
+    """
+    normalized = ' '.join(text.split())
+    return hashlib.sha1(f"{analyzer_version}\0{normalized}".encode('utf-8')).hexdigest()
+
+
+class ScoreCache:
+    """Bounded in-memory LRU of score dicts, backed by SQLite when a path is given"""
+
+    def __init__(self, max_entries: int = SCORE_CACHE_SIZE, disk_path: str = SCORE_CACHE_PATH):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.disk_path = disk_path
+        self._disk = None
+        if disk_path:
+            self._disk = self._connect()
+            logger.info(f"Score cache disk tier opened at {disk_path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.disk_path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS scores '
+            '(key TEXT PRIMARY KEY, compound REAL, pos REAL, neu REAL, neg REAL)'
+        )
+        conn.commit()
+        return conn
+
+    def reopen(self):
+        """Reconnect the disk tier in a forked process; the memory tier is kept"""
+        self._lock = threading.Lock()
+        if self.disk_path:
+            self._disk = self._connect()
+
+    def get(self, key: str) -> Optional[Dict[str, float]]:
+        """Look up a score by key, promoting disk hits into memory"""
+        with self._lock:
+            scores = self._entries.get(key)
+            if scores is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(scores)
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    'SELECT compound, pos, neu, neg FROM scores WHERE key = ?', (key,)
+                ).fetchone()
+                if row:
+                    scores = dict(zip(SCORE_FIELDS, row))
+                    self._remember(key, scores)
+                    self.disk_hits += 1
+                    return dict(scores)
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, scores: Dict[str, float]):
+        """Store a freshly computed score in memory and on disk"""
+        scores = {field: float(scores.get(field, 0.0)) for field in SCORE_FIELDS}
+        with self._lock:
+            self._remember(key, scores)
+            if self._disk is not None:
+                with self._disk:
+                    self._disk.execute(
+                        'INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?)',
+                        (key, *(scores[field] for field in SCORE_FIELDS))
+                    )
+
+    def _remember(self, key: str, scores: Dict[str, float]):
+        """Insert into the LRU, evicting the oldest entries past the bound"""
+        self._entries[key] = scores
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters for sizing the cache"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
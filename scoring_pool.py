@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Scoring Pool
+Process pool that runs VADER scoring outside the GIL of the API process
+"""
+
+import os
+import math
+import threading
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict
+
+logger = logging.getLogger(__name__)
+
+SCORING_WORKERS = int(os.getenv('SCORING_WORKERS', str(os.cpu_count() or 1)))
+# Batches smaller than this are scored inline, the IPC round-trip would cost more
+POOL_MIN_BATCH = int(os.getenv('SCORING_POOL_MIN_BATCH', '16'))
+# Chunks in flight per worker beyond which callers should fall back to a cheaper scorer
+POOL_MAX_PENDING_PER_WORKER = int(os.getenv('SCORING_POOL_MAX_PENDING_PER_WORKER', '4'))
+
+# Analyzer preloaded once per worker process by _init_worker
+_worker_analyzer = None
+
+
+def share_analyzer(analyzer):
+    """Hand an analyzer loaded in this process to forked workers instead of reloading the lexicon"""
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+
+def _init_worker():
+    """Load the VADER lexicon once when a worker process starts, unless inherited through fork"""
+    global _worker_analyzer
+    if _worker_analyzer is not None:
+        return
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    _worker_analyzer = SentimentIntensityAnalyzer()
+
+
+def _score_chunk(texts: List[str]) -> List[Dict[str, float]]:
+    """Score a chunk of texts inside a worker process"""
+    return [_worker_analyzer.polarity_scores(text) for text in texts]
+
+
+class ScoringPool:
+    """Lazily started process pool for batch sentiment scoring"""
+
+    def __init__(self, workers: int = SCORING_WORKERS, min_batch: int = POOL_MIN_BATCH):
+        self.workers = workers
+        self.min_batch = min_batch
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._pending_texts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    @property
+    def pending(self) -> int:
+        """Number of chunks submitted and not yet scored"""
+        return self._pending
+
+    @property
+    def pending_texts(self) -> int:
+        """Number of texts submitted and not yet scored"""
+        return self._pending_texts
+
+    @property
+    def saturated(self) -> bool:
+        """True when a new batch would queue behind several others"""
+        return self._pending >= self.workers * POOL_MAX_PENDING_PER_WORKER
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+                logger.info(f"Started sentiment scoring pool with {self.workers} workers")
+            return self._executor
+
+    def score(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Score texts across the worker processes, preserving input order"""
+        if not texts:
+            return []
+
+        executor = self._get_executor()
+        chunk_size = max(1, math.ceil(len(texts) / self.workers))
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+
+        remaining = len(chunks)
+        remaining_texts = len(texts)
+        with self._lock:
+            self._pending += remaining
+            self._pending_texts += remaining_texts
+        try:
+            results = []
+            for chunk_scores in executor.map(_score_chunk, chunks):
+                results.extend(chunk_scores)
+                remaining -= 1
+                remaining_texts -= len(chunk_scores)
+                with self._lock:
+                    self._pending -= 1
+                    self._pending_texts -= len(chunk_scores)
+            return results
+        finally:
+            if remaining:
+                with self._lock:
+                    self._pending -= remaining
+                    self._pending_texts -= remaining_texts
+
+    def warm(self):
+        """Start every worker process now rather than on the first large batch"""
+        if not self.enabled:
+            return
+        executor = self._get_executor()
+        list(executor.map(_score_chunk, [['warm up']] * self.workers))
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
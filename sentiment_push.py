@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Sentiment Push
+Fan-out of aggregate sentiment changes to subscribed clients
+"""
+
+import queue
+import threading
+import logging
+from collections import Counter
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bound per-client backlog so a stalled client cannot grow memory without limit
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+def aggregate_fingerprint(summary: Dict) -> Tuple:
+    """The parts of a summary whose change is worth pushing to clients"""
+    aggregate = summary.get('aggregate_sentiment', {})
+    return (
+        round(aggregate.get('average_sentiment', 0.0), 4),
+        round(aggregate.get('sentiment_confidence', 0.0), 4),
+        aggregate.get('total_articles', 0),
+        aggregate.get('positive_count', 0),
+        aggregate.get('negative_count', 0),
+        aggregate.get('neutral_count', 0)
+    )
+
+
+class Subscription:
+    """One connected client's symbol set and pending updates"""
+
+    def __init__(self, keys: Iterable[Tuple[str, int]]):
+        self.keys = set(keys)
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def offer(self, update: Dict):
+        try:
+            self.queue.put_nowait(update)
+        except queue.Full:
+            # Drop the oldest update, the newest aggregate is what matters
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.queue.put_nowait(update)
+
+    def next_update(self, timeout: float) -> Optional[Dict]:
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class SentimentBroadcaster:
+    """Pushes a symbol's summary to its subscribers only when the aggregate changed"""
+
+    def __init__(self, on_first_subscriber: Callable[[str, int], None] = None,
+                 on_last_unsubscribe: Callable[[str, int], None] = None,
+                 max_subscriptions: Optional[int] = None):
+        self.on_first_subscriber = on_first_subscriber
+        self.on_last_unsubscribe = on_last_unsubscribe
+        self.max_subscriptions = max_subscriptions
+        self._subscriptions = set()
+        self._refcounts = Counter()
+        self._last = {}  # (symbol, days) -> (fingerprint, summary), only for subscribed keys
+        self._lock = threading.Lock()
+        self.published = 0
+        self.suppressed = 0
+        self.rejected = 0
+
+    def subscribe(self, keys: Iterable[Tuple[str, int]]) -> Optional[Subscription]:
+        """Register a client, or return None when max_subscriptions are already open"""
+        subscription = Subscription(keys)
+        first = []
+        with self._lock:
+            if self.max_subscriptions is not None and len(self._subscriptions) >= self.max_subscriptions:
+                self.rejected += 1
+                return None
+            self._subscriptions.add(subscription)
+            for key in subscription.keys:
+                self._refcounts[key] += 1
+                if self._refcounts[key] == 1:
+                    first.append(key)
+        for symbol, days in first:
+            if self.on_first_subscriber:
+                self.on_first_subscriber(symbol, days)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        last = []
+        with self._lock:
+            if subscription not in self._subscriptions:
+                return
+            self._subscriptions.discard(subscription)
+            for key in subscription.keys:
+                self._refcounts[key] -= 1
+                if self._refcounts[key] <= 0:
+                    del self._refcounts[key]
+                    self._last.pop(key, None)
+                    last.append(key)
+        for symbol, days in last:
+            if self.on_last_unsubscribe:
+                self.on_last_unsubscribe(symbol, days)
+
+    def latest(self, symbol: str, days: int) -> Optional[Dict]:
+        """Most recently published summary for a key"""
+        with self._lock:
+            entry = self._last.get((symbol, days))
+        return entry[1] if entry else None
+
+    def publish(self, symbol: str, days: int, summary: Dict) -> bool:
+        """Send a refreshed summary to subscribers if its aggregate changed"""
+        if not summary:
+            return False
+        key = (symbol, days)
+        fingerprint = aggregate_fingerprint(summary)
+        with self._lock:
+            # Summaries nobody listens to are not kept, any ?days= value makes a new key
+            if not self._refcounts.get(key):
+                return False
+            previous = self._last.get(key)
+            if previous and previous[0] == fingerprint:
+                self.suppressed += 1
+                return False
+            self._last[key] = (fingerprint, summary)
+            targets = [sub for sub in self._subscriptions if key in sub.keys]
+            self.published += 1
+
+        update = {'symbol': symbol, 'days': days, 'data': summary}
+        for subscription in targets:
+            subscription.offer(update)
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'subscribers': len(self._subscriptions),
+                'subscribed_keys': len(self._refcounts),
+                'rejected_subscriptions': self.rejected,
+                'published': self.published,
+                'suppressed_unchanged': self.suppressed
+            }
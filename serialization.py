@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Serialization
+Encode API payloads once into JSON bytes, precompressed variants and a content hash
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this are not worth compressing
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+GZIP_LEVEL = 6
+
+try:
+    import orjson
+
+    def dumps(data: Any) -> bytes:
+        """Serialize to compact JSON bytes"""
+        return orjson.dumps(data, default=str)
+except ImportError:
+    logger.warning("orjson not available, using the standard json module. Install with: pip install orjson")
+
+    def dumps(data: Any) -> bytes:
+        """Serialize to compact JSON bytes"""
+        return json.dumps(data, separators=(',', ':'), default=str).encode('utf-8')
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+@dataclass(slots=True)
+class SerializedResponse:
+    """A payload plus its ready-to-send encodings, stored together in the cache"""
+    data: Any
+    body: bytes
+    etag: str
+    gzip_body: Optional[bytes] = None
+    brotli_body: Optional[bytes] = None
+
+    def encoded(self, encoding: str) -> Optional[bytes]:
+        """Precompressed body for a content-coding, None when not available"""
+        if encoding == 'br':
+            return self.brotli_body
+        if encoding == 'gzip':
+            return self.gzip_body
+        return None
+
+
+def serialize_response(data: Any) -> SerializedResponse:
+    """Serialize and compress a payload once, hashing the body for the ETag"""
+    with span('serialize'):
+        body = dumps(data)
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+
+        gzip_body = None
+        brotli_body = None
+        if len(body) >= COMPRESS_MIN_BYTES:
+            gzip_body = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+            if brotli is not None:
+                brotli_body = brotli.compress(body, quality=5)
+
+    return SerializedResponse(data=data, body=body, etag=etag, gzip_body=gzip_body, brotli_body=brotli_body)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Production Server
+Runs the API under gunicorn with the app, VADER lexicon and routing preloaded once in the
+master so forked workers share them copy-on-write
+"""
+
+import os
+import gc
+import sys
+import time
+import argparse
+import logging
+
+BOOT_STARTED = time.perf_counter()
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:
+    BaseApplication = None
+    logger.warning("gunicorn not available, falling back to a single-process server. Install with: pip install gunicorn")
+
+DEFAULT_WORKERS = int(os.getenv('WEB_CONCURRENCY', str(min(8, (os.cpu_count() or 1) * 2 + 1))))
+# Threads per worker; SSE subscriptions hold one thread each while open, capped at half
+DEFAULT_THREADS = int(os.getenv('WEB_THREADS', '16'))
+DEFAULT_TIMEOUT = int(os.getenv('WEB_TIMEOUT', '60'))
+
+
+def process_memory(pid: str = 'self') -> dict:
+    """RSS, PSS and shared/private memory in MB from /proc (Linux), or peak RSS elsewhere"""
+    try:
+        fields = {}
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+        return {
+            'rss_mb': round(fields.get('Rss', 0), 1),
+            'pss_mb': round(fields.get('Pss', 0), 1),
+            'shared_mb': round(fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0), 1),
+            'private_mb': round(fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0), 1)
+        }
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kB, macOS bytes
+        return {'max_rss_mb': round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)}
+
+
+def preload_app():
+    """Import the app and exercise every lazy path so workers fork from a warm master"""
+    started = time.perf_counter()
+    import app as app_module
+    from scoring_pool import share_analyzer
+    from serialization import serialize_response
+
+    scraper = app_module.news_scraper
+    if scraper.sentiment_analyzer:
+        scraper.sentiment_analyzer.polarity_scores("Shares rose after strong earnings")
+        # Scoring pool processes forked later inherit this analyzer instead of reloading the lexicon
+        share_analyzer(scraper.sentiment_analyzer)
+    serialize_response({'warm': [1, 2.5, 'up']})
+
+    # Compiles the URL map and runs the request hooks once
+    with app_module.app.test_client() as client:
+        client.get('/')
+
+    logger.info(f"Preloaded app in {time.perf_counter() - started:.2f}s, master memory {process_memory()}")
+    return app_module
+
+
+def post_fork_worker(app_module):
+    """Per-worker setup: private SQLite connections and background threads"""
+    app_module.article_store.reopen()
+    app_module.news_scraper.score_cache.reopen()
+    app_module.start_background_services()
+
+
+def warm_worker(app_module):
+    """Start the worker's scoring processes before it accepts requests, then report readiness"""
+    pool = app_module.news_scraper.scoring_pool
+    if pool:
+        pool.warm()
+    logger.info(f"Worker {os.getpid()} ready {time.perf_counter() - BOOT_STARTED:.2f}s after boot, "
+                f"memory {process_memory()}")
+
+
+if BaseApplication is not None:
+    class SentimentServer(BaseApplication):
+        """gunicorn application with the API preloaded in the master"""
+
+        def __init__(self, app_module, options: dict):
+            self.app_module = app_module
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+            app_module = self.app_module
+            self.cfg.set('when_ready', lambda server: gc.freeze())
+            self.cfg.set('post_fork', lambda server, worker: post_fork_worker(app_module))
+            self.cfg.set('post_worker_init', lambda worker: warm_worker(app_module))
+
+        def load(self):
+            return self.app_module.app
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Run the News Sentiment API with pre-forked workers')
+    parser.add_argument('--bind', default=f"0.0.0.0:{os.getenv('PORT', '5002')}")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--threads', type=int, default=DEFAULT_THREADS)
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Each worker gets a share of the CPUs for its scoring processes (read at import time)
+    os.environ.setdefault('SCORING_WORKERS', str(max(1, (os.cpu_count() or 1) // max(1, args.workers))))
+    # Open SSE streams may take at most half of each worker's threads
+    os.environ.setdefault('SUBSCRIBE_MAX_STREAMS', str(max(1, args.threads // 2)))
+    # Provider quotas are per API key, so workers spend from one set of buckets kept
+    # in the shared cache's SQLite file rather than N private copies
+    if args.workers > 1:
+        os.environ.setdefault('PROVIDER_QUOTA_PATH', os.getenv('SENTIMENT_CACHE_PATH', 'sentiment_cache.db'))
+
+    app_module = preload_app()
+
+    if BaseApplication is None:
+        host, _, port = args.bind.rpartition(':')
+        post_fork_worker(app_module)
+        warm_worker(app_module)
+        app_module.app.run(host=host or '0.0.0.0', port=int(port), threaded=True)
+        return
+
+    logger.info(f"Starting {args.workers} workers x {args.threads} threads on {args.bind}")
+    SentimentServer(app_module, {
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': 'gthread',
+        'timeout': args.timeout,
+        'keepalive': 5,
+        'preload_app': True
+    }).run()
+
+
+if __name__ == '__main__':
+    main()
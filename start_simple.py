@@ -34,7 +34,8 @@ def main():
     
     try:
         # Import and run the Flask app directly
-        from app import app
+        from app import app, start_background_services
+        start_background_services()
         app.run(host='0.0.0.0', port=5002, debug=True)
     except KeyboardInterrupt:
         print("\n👋 Server stopped by user")
@@ -50,5 +51,5 @@ if __name__ == "__main__":
         print("\n🔧 If you see errors:")
         print("   1. Run: pip install -r requirements.txt")
         print("   2. Check Python version: python --version")
-        print("   3. Try: python test_news_scraper.py")
+        print("   3. Try an offline smoke run: python -m benchmarks.run --quick --no-save")
         sys.exit(1)
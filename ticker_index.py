@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Ticker Index
+Inverted index from ticker to the Alpha Vantage articles that mention it, scored per ticker
+"""
+
+import os
+import time
+import threading
+import logging
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# How far back postings are kept, and how many per ticker
+TICKER_INDEX_MAX_DAYS = int(os.getenv('TICKER_INDEX_MAX_DAYS', os.getenv('NEWS_WINDOW_MAX_DAYS', '30')))
+TICKER_INDEX_MAX_PER_TICKER = int(os.getenv('TICKER_INDEX_MAX_PER_TICKER', '2000'))
+
+Coverage = Tuple[int, float]  # (complete from published_ts, as of fetch time)
+
+
+def _merge(current: Optional[Coverage], new: Coverage) -> Coverage:
+    """Extend a coverage interval when the new one overlaps it, else replace it with the newer one"""
+    if current is None:
+        return new
+    current_from, current_until = current
+    new_from, new_until = new
+    if new_from <= current_until and current_from <= new_until:
+        return min(current_from, new_from), max(current_until, new_until)
+    return new if new_until >= current_until else current
+
+
+class TickerIndex:
+    """Postings of ticker -> url -> article carrying that ticker's own sentiment score.
+
+    An article mentioning several tickers is stored once per ticker, each copy
+    sharing the text fields. Coverage intervals record which time ranges are
+    known to be complete: per ticker for single-ticker calls, and for every
+    ticker at once for the market-wide feed, which lists all news in its range.
+    """
+
+    def __init__(self, label_fn: Callable[[float], str], max_days: int = TICKER_INDEX_MAX_DAYS,
+                 max_per_ticker: int = TICKER_INDEX_MAX_PER_TICKER):
+        self.label_fn = label_fn
+        self.max_days = max_days
+        self.max_per_ticker = max_per_ticker
+        self._postings: Dict[str, Dict[str, object]] = {}
+        self._ticker_coverage: Dict[str, Coverage] = {}
+        self._feed_coverage: Optional[Coverage] = None
+        self._lock = threading.Lock()
+
+    def add(self, entries: List[Tuple[object, Dict[str, float]]]) -> int:
+        """Index (article, {ticker: score}) pairs, returning the number of postings added"""
+        cutoff = int(time.time()) - self.max_days * 86400
+        added = 0
+        with self._lock:
+            touched = set()
+            for article, ticker_scores in entries:
+                if article.published_ts < cutoff:
+                    continue
+                for ticker, score in ticker_scores.items():
+                    postings = self._postings.setdefault(ticker, {})
+                    if article.url not in postings:
+                        added += 1
+                    postings[article.url] = replace(article, sentiment_score=score,
+                                                    sentiment_label=self.label_fn(score))
+                    touched.add(ticker)
+            for ticker in touched:
+                self._prune(ticker, cutoff)
+        return added
+
+    def _prune(self, ticker: str, cutoff: int):
+        """Drop postings past the retention age or beyond the per-ticker cap (oldest first)"""
+        postings = self._postings[ticker]
+        expired = [url for url, article in postings.items() if article.published_ts < cutoff]
+        for url in expired:
+            del postings[url]
+        overflow = len(postings) - self.max_per_ticker
+        if overflow > 0:
+            oldest = sorted(postings.values(), key=lambda article: article.published_ts)[:overflow]
+            for article in oldest:
+                del postings[article.url]
+            # The ticker's history no longer reaches back as far as recorded
+            coverage = self._ticker_coverage.get(ticker)
+            if coverage:
+                self._ticker_coverage[ticker] = (max(coverage[0], oldest[-1].published_ts + 1), coverage[1])
+
+    def mark_ticker_covered(self, ticker: str, from_ts: int, fetched_at: float):
+        with self._lock:
+            self._ticker_coverage[ticker] = _merge(self._ticker_coverage.get(ticker), (from_ts, fetched_at))
+
+    def mark_feed_covered(self, from_ts: int, fetched_at: float):
+        with self._lock:
+            self._feed_coverage = _merge(self._feed_coverage, (from_ts, fetched_at))
+
+    @property
+    def feed_coverage(self) -> Optional[Coverage]:
+        return self._feed_coverage
+
+    def coverage(self, ticker: str) -> Optional[Coverage]:
+        """Time range over which the ticker's postings are complete, combining both sources"""
+        with self._lock:
+            ticker_coverage = self._ticker_coverage.get(ticker)
+            feed_coverage = self._feed_coverage
+        if ticker_coverage is None or feed_coverage is None:
+            return ticker_coverage or feed_coverage
+        # Disjoint intervals leave only the one ending at the newer fetch usable
+        return _merge(ticker_coverage, feed_coverage)
+
+    def lookup(self, ticker: str, since_ts: int, max_age: float) -> Optional[List]:
+        """Articles for the ticker published at or after since_ts, newest first.
+
+        Returns None when the index cannot answer: the ticker's complete range does
+        not reach back to since_ts or was last refreshed more than max_age ago.
+        """
+        coverage = self.coverage(ticker)
+        if coverage is None or coverage[0] > since_ts or time.time() - coverage[1] > max_age:
+            return None
+        return self.articles(ticker, since_ts)
+
+    def articles(self, ticker: str, since_ts: int) -> List:
+        """Indexed articles for the ticker published at or after since_ts, newest first, complete or not"""
+        with self._lock:
+            articles = [article for article in self._postings.get(ticker, {}).values()
+                        if article.published_ts >= since_ts]
+        articles.sort(key=lambda article: article.published_ts, reverse=True)
+        return articles
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'tickers': len(self._postings),
+                'postings': sum(len(postings) for postings in self._postings.values()),
+                'feed_refreshed_at': self._feed_coverage[1] if self._feed_coverage else None
+            }
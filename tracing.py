@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Tracing
+Per-request stage timings carried in a context variable, plus on-demand cProfile capture
+"""
+
+import os
+import re
+import time
+import pstats
+import cProfile
+import itertools
+import threading
+import contextvars
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = Path(os.getenv('PROFILE_DIR', 'profiles'))
+PROFILE_MAX_REQUESTS = int(os.getenv('PROFILE_MAX_REQUESTS', '100'))
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar('current_trace', default=None)
+_current_capture: contextvars.ContextVar = contextvars.ContextVar('profile_capture', default=None)
+
+
+class Trace:
+    """Stage durations for one request; spans may be recorded from worker threads"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, List[float]] = {}  # name -> [total seconds, count]
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            stage = self.stages.setdefault(name, [0.0, 0])
+            stage[0] += seconds
+            stage[1] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, stages in first-recorded order followed by the total"""
+        with self._lock:
+            stages = list(self.stages.items())
+        entries = []
+        for name, (seconds, count) in stages:
+            entry = f"{name};dur={seconds * 1000:.1f}"
+            if count > 1:
+                entry += f';desc="{count} calls"'
+            entries.append(entry)
+        entries.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ', '.join(entries)
+
+
+def start_trace() -> contextvars.Token:
+    return _current_trace.set(Trace())
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def end_trace(token: contextvars.Token):
+    _current_trace.reset(token)
+
+
+@contextmanager
+def span(name: str):
+    """Time a block into the current request's trace; a no-op outside a traced request"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.record(name, time.perf_counter() - started)
+
+
+def propagate(fn: Callable) -> Callable:
+    """Bind fn to the caller's context so spans (and profiling) from executor threads reach the same request"""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.run(_profiled, fn, *args, **kwargs)
+    return run
+
+
+def _profiled(fn: Callable, *args, **kwargs):
+    """Run fn, profiling it into the request's capture when that request is being profiled"""
+    capture = _current_capture.get()
+    if capture is None or capture.closed:
+        return fn(*args, **kwargs)
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12+ has one interpreter-wide profiler, which already sees this thread
+        return fn(*args, **kwargs)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profiler.disable()
+        capture.add(profiler)
+
+
+class ProfileCapture:
+    """A profiled request: its own profiler plus one per executor task run on its behalf.
+
+    cProfile only sees the thread that enabled it (before Python 3.12), so
+    provider fetches, paging and scoring in executor threads are profiled by
+    the propagate() wrapper and merged into the request's dump.
+    """
+
+    def __init__(self, profiler: cProfile.Profile):
+        self.profiler = profiler
+        self.task_profilers: List[cProfile.Profile] = []
+        self.closed = False
+        self.token = None
+        self._lock = threading.Lock()
+
+    def add(self, profiler: cProfile.Profile):
+        with self._lock:
+            # Tasks abandoned at a deadline may finish after the dump was written
+            if not self.closed:
+                self.task_profilers.append(profiler)
+
+    def close(self) -> List[cProfile.Profile]:
+        with self._lock:
+            self.closed = True
+            return list(self.task_profilers)
+
+
+class ProfileSampler:
+    """Captures cProfile dumps for the next N requests, one request at a time.
+
+    One request is profiled at a time, so requests arriving while another is
+    being profiled are served unprofiled and do not use up the remaining count.
+    Work the request hands to executors through propagate() is included.
+    Dumps are pstats files (snakeviz, flameprof, gprof2dot).
+    """
+
+    def __init__(self, directory: Path = PROFILE_DIR):
+        self.directory = Path(directory)
+        self.remaining = 0
+        self.captured: List[str] = []
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+
+    def arm(self, requests: int) -> int:
+        """Profile the next `requests` requests (capped at PROFILE_MAX_REQUESTS)"""
+        with self._lock:
+            self.remaining = max(0, min(requests, PROFILE_MAX_REQUESTS))
+            return self.remaining
+
+    def begin(self) -> Optional[ProfileCapture]:
+        """Start profiling the current request if armed and no other request is profiled"""
+        if not self.remaining:
+            return None
+        if not self._active.acquire(blocking=False):
+            return None
+        with self._lock:
+            if not self.remaining:
+                self._active.release()
+                return None
+            self.remaining -= 1
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Another profiler (e.g. a debugger) already owns the hook
+            logger.warning(f"Could not start profiler: {e}")
+            self._active.release()
+            return None
+        capture = ProfileCapture(profiler)
+        capture.token = _current_capture.set(capture)
+        return capture
+
+    def finish(self, capture: ProfileCapture, label: str) -> Optional[str]:
+        """Stop profiling and write the merged dump, returning its path (None if it could not be written)"""
+        try:
+            capture.profiler.disable()
+            task_profilers = capture.close()
+            try:
+                _current_capture.reset(capture.token)
+            except ValueError:
+                pass  # Finished from a different context than begin()
+            stats = pstats.Stats(capture.profiler)
+            for profiler in task_profilers:
+                try:
+                    stats.add(profiler)
+                except TypeError:
+                    pass  # A task that recorded no calls
+            self.directory.mkdir(parents=True, exist_ok=True)
+            safe_label = re.sub(r'[^A-Za-z0-9_.-]+', '_', label).strip('_') or 'request'
+            path = self.directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(self._sequence)}-{safe_label}.prof"
+            stats.dump_stats(str(path))
+        except Exception as e:
+            logger.error(f"Could not write request profile for {label}: {e}")
+            return None
+        finally:
+            self._active.release()
+        with self._lock:
+            self.captured.append(str(path))
+            self.captured = self.captured[-50:]
+        logger.info(f"Wrote request profile {path}")
+        return str(path)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'remaining': self.remaining, 'directory': str(self.directory), 'captured': list(self.captured)}